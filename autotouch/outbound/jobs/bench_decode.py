@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+import argparse
+import gzip
+import io
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from shared.integrations.rapidapi.codec import JSON_BACKEND, decompressor, loads_json
+
+WORDS = (
+    "sales development representative pipeline outbound prospecting quota "
+    "crm salesforce hubspot clay apollo cadence meetings pipeline revenue "
+    "team growth remote hybrid benefits equity customers enterprise smb"
+).split()
+
+
+def synthetic_payload(jobs: int, description_words: int, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    payload = []
+    for i in range(jobs):
+        payload.append(
+            {
+                "id": str(1000000 + i),
+                "title": "Sales Development Representative",
+                "organization": f"Company {i % 97}",
+                "organization_url": f"https://www.linkedin.com/company/company-{i % 97}",
+                "date_posted": "2026-01-20T12:00:00",
+                "locations_derived": ["New York, NY, United States"],
+                "url": f"https://www.linkedin.com/jobs/view/{1000000 + i}",
+                "description_text": " ".join(rng.choice(WORDS) for _ in range(description_words)),
+                "linkedin_org_employees": rng.randint(5, 500),
+            }
+        )
+    return payload
+
+
+def legacy_decode(data: bytes) -> Any:
+    text = data.decode("utf-8", errors="replace")
+    return json.loads(text)
+
+
+def gzip_stream_decode(data: bytes) -> Any:
+    decoder = decompressor("gzip")
+    stream = io.BytesIO(data)
+    chunks = []
+    while True:
+        chunk = stream.read(64 * 1024)
+        if not chunk:
+            break
+        chunks.append(decoder.decompress(chunk))
+    chunks.append(decoder.flush())
+    return loads_json(b"".join(chunks))
+
+
+def time_it(func: Callable[[bytes], Any], data: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure wire size and decode time of a job search response."
+    )
+    parser.add_argument(
+        "--payload",
+        default=None,
+        help="Path to a saved JSON response body (defaults to a synthetic 7d page).",
+    )
+    parser.add_argument("--jobs", type=int, default=500, help="Synthetic jobs per page.")
+    parser.add_argument(
+        "--description-words",
+        type=int,
+        default=600,
+        help="Words per synthetic job description.",
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Timing repetitions (best of).")
+    args = parser.parse_args()
+
+    if args.payload:
+        raw = Path(args.payload).read_bytes()
+    else:
+        raw = json.dumps(synthetic_payload(args.jobs, args.description_words)).encode("utf-8")
+    compressed = gzip.compress(raw, compresslevel=6)
+
+    print(f"Identity body: {len(raw):,} bytes")
+    print(f"Gzip body:     {len(compressed):,} bytes ({len(compressed) / len(raw):.1%} of identity)")
+    print(f"JSON backend:  {JSON_BACKEND}")
+
+    legacy = time_it(legacy_decode, raw, args.repeat)
+    direct = time_it(loads_json, raw, args.repeat)
+    inflate = time_it(gzip_stream_decode, compressed, args.repeat)
+    print(f"bytes -> str -> json.loads:   {legacy * 1000:8.2f} ms")
+    print(f"loads_json(bytes):            {direct * 1000:8.2f} ms ({legacy / direct:.2f}x)")
+    print(f"gzip stream inflate + parse:  {inflate * 1000:8.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
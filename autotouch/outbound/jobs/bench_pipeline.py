@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from shared.integrations.rapidapi.jobs import active_jobs_db, client as jobs_client
+from shared.integrations.rapidapi.jobs.active_jobs_db import RapidApiActiveJobsDbClient
+from shared.integrations.rapidapi.jobs.client import RapidApiLinkedInJobsClient
+from shared.integrations.rapidapi.metrics import MetricsRegistry
+from shared.integrations.rapidapi.replay import FixtureStore, ReplayServer
+from shared.integrations.rapidapi.retry import CircuitBreakerRegistry, RetryPolicy
+from shared.integrations.rapidapi.transport import RapidApiTransport
+from outbound.jobs.bench_decode import synthetic_payload
+from outbound.jobs.job_fetch import build_record, fetch_jobs, normalize_keywords, plan_fetch_tasks
+from outbound.jobs.pipeline import DEFAULT_QUEUE_SIZE, stream_jobs
+from outbound.jobs.webhook import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_TARGET_SECONDS,
+    ByteBudget,
+    WebhookSender,
+    batches_by_bytes,
+    chunked,
+)
+
+SOURCES = (
+    (
+        jobs_client.DEFAULT_JOBS_HOST,
+        (jobs_client.JOBS_24H_PATH, jobs_client.JOBS_7D_PATH),
+    ),
+    (
+        active_jobs_db.DEFAULT_ACTIVE_JOBS_HOST,
+        (active_jobs_db.JOBS_24H_PATH, active_jobs_db.JOBS_7D_PATH),
+    ),
+)
+
+
+def synthetic_store(jobs: int, description_words: int) -> FixtureStore:
+    store = FixtureStore()
+    for seed, (host, endpoints) in enumerate(SOURCES):
+        payload = synthetic_payload(jobs, description_words, seed=seed)
+        for endpoint in endpoints:
+            store.add(host, endpoint, 200, {}, payload)
+    return store
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def run_once(
+    args: argparse.Namespace,
+    store: FixtureStore,
+    keywords: List[str],
+    registry: MetricsRegistry,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    server = ReplayServer(
+        store,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        ingest_error_rate=args.ingest_error_rate,
+        ingest_max_bytes=args.ingest_max_bytes,
+        ingest_seconds_per_mb=args.ingest_seconds_per_mb,
+        page_size=args.page_size,
+        seed=seed,
+    )
+    transport = RapidApiTransport(
+        retry_policy=RetryPolicy(base_delay=0.05),
+        circuit_breakers=CircuitBreakerRegistry(),
+        metrics=registry,
+        connection_factory=server.connection_factory,
+    )
+    budget = (
+        ByteBudget(args.batch_bytes, target_seconds=args.ingest_target_seconds)
+        if args.batch_bytes
+        else None
+    )
+    sender = WebhookSender(
+        f"{server.url}/ingest",
+        "bench",
+        concurrency=args.webhook_concurrency,
+        retry_policy=RetryPolicy(base_delay=0.05, methods=frozenset({"POST"})),
+        metrics=registry,
+        budget=budget,
+        gzip=args.webhook_gzip,
+    )
+    with server, transport, sender:
+        linkedin_client = RapidApiLinkedInJobsClient(api_key="bench", transport=transport)
+        active_client = RapidApiActiveJobsDbClient(api_key="bench", transport=transport)
+
+        started = time.perf_counter()
+        if args.stream:
+            return stream_once(args, sender, linkedin_client, active_client, keywords, registry, started)
+        jobs_by_key, sources_by_key, keywords_by_key = fetch_jobs(
+            linkedin_client,
+            active_client,
+            args.window,
+            "sdr",
+            keywords,
+            None,
+            None,
+            args.limit,
+            max_items=args.max_items,
+            metrics=registry,
+            workers=args.workers,
+            batch_keywords=args.batch_keywords,
+            local_keywords=args.local_keywords,
+        )
+        fetched = time.perf_counter()
+
+        records = [
+            build_record(
+                key,
+                job,
+                sources_by_key.get(key, set()),
+                keywords_by_key.get(key, set()),
+                args.window,
+                None,
+                None,
+            )
+            for key, job in jobs_by_key.items()
+        ]
+        built = time.perf_counter()
+
+        delivered: List[float] = []
+        batches = (
+            batches_by_bytes(records, budget, args.batch_size)
+            if budget
+            else chunked(records, args.batch_size)
+        )
+        report = sender.send(
+            batches,
+            on_delivered=lambda batch: delivered.append(time.perf_counter()),
+        )
+        posted = time.perf_counter()
+        first_post = min(delivered) if delivered else None
+
+    return {
+        "records": report["sent"],
+        "batches": report["batches"],
+        "failed_batches": len(report["failed"]),
+        "fetch": fetched - started,
+        "build": built - fetched,
+        "post": posted - built,
+        "first_post": (first_post or posted) - started,
+        "total": posted - started,
+    }
+
+
+def stream_once(
+    args: argparse.Namespace,
+    sender: WebhookSender,
+    linkedin_client: RapidApiLinkedInJobsClient,
+    active_client: RapidApiActiveJobsDbClient,
+    keywords: List[str],
+    registry: MetricsRegistry,
+    started: float,
+) -> Dict[str, Any]:
+    tasks = plan_fetch_tasks(
+        linkedin_client,
+        active_client,
+        "sdr",
+        keywords,
+        None,
+        None,
+        args.limit,
+        batch_keywords=args.batch_keywords,
+        local_keywords=args.local_keywords,
+    )
+    delivered: List[float] = []
+    with sender.dispatch(lambda batch: delivered.append(time.perf_counter())) as dispatch:
+        stream_jobs(
+            tasks,
+            args.window,
+            lambda job, sources, matched: build_record(
+                job.key, job, sources, matched, args.window, None, None
+            ),
+            dispatch.submit,
+            batch_size=args.batch_size,
+            queue_size=args.queue_size,
+            workers=args.workers,
+            max_items=args.max_items,
+            metrics=registry,
+            budget=sender.budget,
+        )
+        report = dispatch.finish()
+    total = time.perf_counter() - started
+    # Stages overlap when streaming; only the end-to-end figures are comparable.
+    return {
+        "records": report["sent"],
+        "batches": report["batches"],
+        "failed_batches": len(report["failed"]),
+        "fetch": total,
+        "build": 0.0,
+        "post": 0.0,
+        "first_post": (min(delivered) - started) if delivered else total,
+        "total": total,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Offline benchmark: fetch_jobs -> build_record -> webhook POSTs against a local replay server."
+    )
+    parser.add_argument(
+        "--fixtures",
+        default=None,
+        help="Directory of recorded fixtures (RAPIDAPI_RECORD_DIR); defaults to synthetic jobs.",
+    )
+    parser.add_argument("--jobs", type=int, default=500, help="Synthetic jobs per source.")
+    parser.add_argument("--description-words", type=int, default=300, help="Words per synthetic description.")
+    parser.add_argument("--window", choices=("24h", "7d"), default="7d")
+    parser.add_argument("--keywords", nargs="*", default=["Clay", "Apollo", "HubSpot"])
+    parser.add_argument("--limit", type=int, default=50, help="Page size per request.")
+    parser.add_argument("--max-items", type=int, default=None, help="Jobs per source per keyword across pages.")
+    parser.add_argument("--workers", type=int, default=1, help="fetch_jobs worker pool size.")
+    parser.add_argument("--batch-keywords", action="store_true", help="Plan OR-batched keyword queries.")
+    parser.add_argument("--local-keywords", action="store_true", help="One unfiltered query per source, keywords matched locally.")
+    parser.add_argument("--batch-size", type=int, default=100, help="Max records per webhook POST.")
+    parser.add_argument(
+        "--batch-bytes", type=int, default=0, help="Adaptive JSON byte budget per POST (0 = count batches only)."
+    )
+    parser.add_argument("--ingest-target-seconds", type=float, default=DEFAULT_TARGET_SECONDS)
+    parser.add_argument("--webhook-gzip", action="store_true", help="Gzip webhook bodies.")
+    parser.add_argument(
+        "--webhook-concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Webhook POSTs in flight at once."
+    )
+    parser.add_argument("--stream", action="store_true", help="Run the streaming pipeline instead of fetch-then-post.")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE, help="Bound on --stream stage queues.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Replay latency per request (s).")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency per request (s).")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of API requests answered 503.")
+    parser.add_argument("--ingest-error-rate", type=float, default=0.0, help="Fraction of webhook POSTs answered 503.")
+    parser.add_argument("--ingest-max-bytes", type=int, default=None, help="Webhook POSTs above this size get a 413.")
+    parser.add_argument("--ingest-seconds-per-mb", type=float, default=0.0, help="Extra ingest latency per MB posted.")
+    parser.add_argument("--page-size", type=int, default=None, help="Cap on jobs per replayed page.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--metrics-out", default=None, help="Write the metrics registry (.json or .prom).")
+    args = parser.parse_args()
+
+    store = FixtureStore.load(args.fixtures) if args.fixtures else synthetic_store(
+        args.jobs, args.description_words
+    )
+    keywords = normalize_keywords(args.keywords)
+    registry = MetricsRegistry()
+
+    results = [run_once(args, store, keywords, registry, seed=run) for run in range(args.runs)]
+
+    totals = [r["total"] for r in results]
+    records = results[-1]["records"]
+    print(f"Runs: {len(results)}  records/run: {records}  batches/run: {results[-1]['batches']}")
+    failed = sum(r["failed_batches"] for r in results)
+    if failed:
+        print(f"Failed batches after retries: {failed}")
+    stages = ("first_post", "total") if args.stream else ("fetch", "build", "post", "first_post", "total")
+    for stage in stages:
+        values = [r[stage] for r in results]
+        print(
+            f"{stage:>10}: p50 {percentile(values, 0.5) * 1000:8.1f} ms"
+            f"  p95 {percentile(values, 0.95) * 1000:8.1f} ms"
+        )
+    print(f"Throughput: {records / statistics.median(totals):,.0f} records/s (median run)")
+
+    print("\nPer-endpoint request latency:")
+    for series in registry.to_dict()["requests"]:
+        latency = series["latency_seconds"]
+        print(
+            f"  {series['method']:4} {series['host']}{series['endpoint']}: "
+            f"{series['calls']} calls, p50 {latency['p50'] * 1000:.1f} ms, "
+            f"p95 {latency['p95'] * 1000:.1f} ms, statuses {series['statuses']}"
+        )
+
+    if args.metrics_out:
+        registry.dump(args.metrics_out)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
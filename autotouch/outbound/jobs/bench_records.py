@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from outbound.jobs.bench_decode import synthetic_payload
+from outbound.jobs.job_fetch import build_record, job_key
+from outbound.jobs.job_schema import GENERIC_SCHEMA, JobSchema, schema_for_jobs
+
+
+def jsearch_payload(jobs: int, description_words: int, seed: int = 11) -> List[Dict[str, Any]]:
+    """Synthetic jobs shaped like JSearch results (job_* / employer_* keys)."""
+    rng = random.Random(seed)
+    words = "sales pipeline outbound crm quota hubspot clay apollo remote".split()
+    return [
+        {
+            "job_id": f"js-{i}",
+            "job_title": "Business Development Representative",
+            "employer_name": f"Employer {i % 89}",
+            "employer_website": f"employer{i % 89}.com",
+            "job_city": "Austin",
+            "job_apply_link": f"https://jobs.example.com/{i}",
+            "job_posted_at_datetime_utc": "2026-01-20T12:00:00.000Z",
+            "job_employment_type": "FULLTIME",
+            "job_description": " ".join(rng.choice(words) for _ in range(description_words)),
+        }
+        for i in range(jobs)
+    ]
+
+
+def build_all(jobs: List[Dict[str, Any]], schema: JobSchema) -> List[Dict[str, Any]]:
+    return [
+        build_record(job_key(job, schema), job, {"linkedin"}, {"clay"}, "24h", None, None, schema)
+        for job in jobs
+    ]
+
+
+def time_it(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure per-record cost of job_key + build_record with generic vs compiled accessors."
+    )
+    parser.add_argument("--jobs", type=int, default=20000, help="Synthetic jobs per source.")
+    parser.add_argument("--description-words", type=int, default=50, help="Words per description.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best of).")
+    args = parser.parse_args()
+
+    sources = {
+        "linkedin_jobs": synthetic_payload(args.jobs, args.description_words, seed=0),
+        "jsearch": jsearch_payload(args.jobs, args.description_words),
+    }
+    for name, jobs in sources.items():
+        compiled = schema_for_jobs(jobs)
+        if build_all(jobs, compiled) != build_all(jobs, GENERIC_SCHEMA):
+            print(f"{name}: compiled records differ from generic records", file=sys.stderr)
+            return 1
+        generic = time_it(lambda: build_all(jobs, GENERIC_SCHEMA), args.repeat)
+        # Includes schema detection, as a caller would pay it once per response.
+        fast = time_it(lambda: build_all(jobs, schema_for_jobs(jobs)), args.repeat)
+        per = 1e6 / len(jobs)
+        print(
+            f"{name:14} {len(jobs):,} jobs  generic {generic * per:6.2f} us/record"
+            f"  compiled {fast * per:6.2f} us/record ({generic / fast:.2f}x)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -22,6 +22,8 @@ from outbound.shared.job_titles import SDR_TITLES, to_or_query
 from outbound.jobs.job_fetch import (
     dedupe_jobs,
     extract_jobs,
+    derive_24h_response,
+    get_jobs_window,
     job_key,
     summarize_job,
 )
@@ -29,29 +31,34 @@ from outbound.jobs.job_fetch import (
 TITLE_FILTER = to_or_query(SDR_TITLES)
 DESC_FILTER = "Clay"
 LIMIT = 20
+PARAMS = {
+    "limit": LIMIT,
+    "offset": 0,
+    "title_filter": TITLE_FILTER,
+    "description_filter": DESC_FILTER,
+    "description_type": "text",
+}
+# Same request as compare_sdr_clay_7d.py, so with RAPIDAPI_CACHE_DIR set a
+# fresh cached 7d response is filtered to 24h locally instead of re-queried.
+PARAMS_7D = {**PARAMS, "limit": 50}
+
+
+def get_jobs_24h(client) -> dict:
+    derived = derive_24h_response(client, PARAMS_7D)
+    if derived is not None:
+        return derived
+    return get_jobs_window(client, "24h", PARAMS)
 
 
 def main() -> int:
     linkedin_client = RapidApiLinkedInJobsClient()
     active_client = RapidApiActiveJobsDbClient()
 
-    linkedin_resp = linkedin_client.get_jobs_24h(
-        limit=LIMIT,
-        offset=0,
-        title_filter=TITLE_FILTER,
-        description_filter=DESC_FILTER,
-        description_type="text",
-    )
-    active_resp = active_client.get_jobs_24h(
-        limit=LIMIT,
-        offset=0,
-        title_filter=TITLE_FILTER,
-        description_filter=DESC_FILTER,
-        description_type="text",
-    )
+    linkedin_resp = get_jobs_24h(linkedin_client)
+    active_resp = get_jobs_24h(active_client)
 
-    linkedin_jobs = extract_jobs(linkedin_resp)
-    active_jobs = extract_jobs(active_resp)
+    linkedin_jobs = extract_jobs(linkedin_resp)[:LIMIT]
+    active_jobs = extract_jobs(active_resp)[:LIMIT]
 
     linkedin_unique, linkedin_dups = dedupe_jobs(linkedin_jobs)
     active_unique, active_dups = dedupe_jobs(active_jobs)
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_TTL_DAYS = 30.0
+# Set by the run, not the job: a 24h and a 7d run of the same job match, as
+# do runs with other --keywords or that first saw the job on another source.
+RUN_FIELDS = frozenset(
+    {"window", "employees_lte", "employees_gte", "keywords", "sources", "content_hash"}
+)
+# Always present in a delta so the table can upsert it.
+DELTA_FIELDS = ("unknown_id", "content_hash")
+_QUERY_CHUNK = 500
+
+
+def _canonical(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """Stable hash of a webhook record's job content (run fields excluded)."""
+    content = {name: value for name, value in record.items() if name not in RUN_FIELDS}
+    return hashlib.blake2b(_canonical(content), digest_size=8).hexdigest()
+
+
+def field_hashes(record: Dict[str, Any]) -> Dict[str, int]:
+    return {
+        name: zlib.crc32(_canonical(value))
+        for name, value in record.items()
+        if name not in RUN_FIELDS
+    }
+
+
+def delta(record: Dict[str, Any], changed: List[str]) -> Dict[str, Any]:
+    """``record`` slimmed to its key, hash and the ``changed`` fields."""
+    return {
+        name: value
+        for name, value in record.items()
+        if name in DELTA_FIELDS or name in changed
+    }
+
+
+def _digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+
+
+class ContentIndex:
+    """Last delivered content hash per ``unknown_id``, to skip unchanged records.
+
+    Each entry keeps the record's ``content_hash`` plus a CRC per field, so
+    a changed record can be cut down to the fields that differ. Stored in
+    SQLite like ``DedupeIndex``. An entry is refreshed when its record is
+    delivered or found unchanged; entries not refreshed for ``ttl_days``
+    expire and their jobs count as new again.
+    """
+
+    def __init__(
+        self,
+        path: os.PathLike,
+        ttl_days: float = DEFAULT_TTL_DAYS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl_days * 86400
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS content ("
+            " digest BLOB PRIMARY KEY,"
+            " hash TEXT NOT NULL,"
+            " fields TEXT NOT NULL,"
+            " sent_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS content_sent_at ON content (sent_at)")
+        self._db.commit()
+        self.expire()
+
+    def expire(self) -> int:
+        cutoff = self._clock() - self.ttl
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM content WHERE sent_at < ?", (cutoff,))
+            self._db.commit()
+        return cursor.rowcount
+
+    def _lookup(self, digests: List[bytes]) -> Dict[bytes, Tuple[str, str]]:
+        known: Dict[bytes, Tuple[str, str]] = {}
+        with self._lock:
+            for start in range(0, len(digests), _QUERY_CHUNK):
+                chunk = digests[start : start + _QUERY_CHUNK]
+                rows = self._db.execute(
+                    "SELECT digest, hash, fields FROM content WHERE digest IN ({})".format(
+                        ",".join("?" * len(chunk))
+                    ),
+                    chunk,
+                )
+                known.update((digest, (hash_, fields)) for digest, hash_, fields in rows)
+        return known
+
+    def diff(self, records: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Optional[List[str]]]]:
+        """``(record, changed fields)`` for records that are new or changed, in order.
+
+        New records come with ``None``; a changed one lists the fields that
+        differ from the delivered version (including ones added or removed).
+        """
+        digests = [_digest(record["unknown_id"]) for record in records]
+        known = self._lookup(digests)
+        changed: List[Tuple[Dict[str, Any], Optional[List[str]]]] = []
+        unchanged: List[bytes] = []
+        for record, digest in zip(records, digests):
+            stored = known.get(digest)
+            current = record.get("content_hash") or content_hash(record)
+            if stored is None:
+                changed.append((record, None))
+            elif stored[0] == current:
+                unchanged.append(digest)
+            else:
+                before = json.loads(stored[1])
+                after = field_hashes(record)
+                fields = sorted(
+                    name for name in set(before) | set(after) if before.get(name) != after.get(name)
+                )
+                changed.append((record, fields))
+        self._touch(unchanged)
+        return changed
+
+    def _touch(self, digests: List[bytes]) -> None:
+        now = self._clock()
+        with self._lock:
+            for start in range(0, len(digests), _QUERY_CHUNK):
+                chunk = digests[start : start + _QUERY_CHUNK]
+                self._db.execute(
+                    "UPDATE content SET sent_at = ? WHERE digest IN ({})".format(
+                        ",".join("?" * len(chunk))
+                    ),
+                    (now, *chunk),
+                )
+            self._db.commit()
+
+    def add_many(self, records: Iterable[Dict[str, Any]], merge: bool = False) -> None:
+        """Remember ``records`` as delivered.
+
+        With ``merge`` the records may be deltas: their field CRCs are laid
+        over the stored ones instead of replacing them.
+        """
+        records = list(records)
+        digests = [_digest(record["unknown_id"]) for record in records]
+        known = self._lookup(digests) if merge else {}
+        now = self._clock()
+        rows = []
+        for record, digest in zip(records, digests):
+            fields = field_hashes(record)
+            if digest in known:
+                fields = {**json.loads(known[digest][1]), **fields}
+            rows.append(
+                (
+                    digest,
+                    record.get("content_hash") or content_hash(record),
+                    json.dumps(fields, separators=(",", ":")),
+                    now,
+                )
+            )
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO content (digest, hash, fields, sent_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM content").fetchone()[0]
+        return {"keys": count}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "ContentIndex":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,152 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+DEFAULT_TTL_DAYS = 30.0
+# Keys are looked up in chunks so one query covers many candidates.
+_QUERY_CHUNK = 500
+
+
+def _digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 8-byte key digests (double hashing)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        capacity = max(1, capacity)
+        self.size = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest: bytes) -> Iterable[int]:
+        h1 = int.from_bytes(digest[:4], "little")
+        h2 = int.from_bytes(digest[4:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, digest: bytes) -> None:
+        for position in self._positions(digest):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, digest: bytes) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+
+class DedupeIndex:
+    """On-disk set of job keys already delivered, with per-key expiry.
+
+    Keys are stored as 8-byte digests in a SQLite table (about 35 MB per
+    million) and checked in batches against its primary key, which takes a
+    few ms per thousand keys. With ``bloom`` an in-memory Bloom filter is
+    loaded at open (seconds per million keys) and answers misses without
+    touching SQLite, which pays off only when the file sits on slow storage.
+    Entries older than ``ttl_days`` expire. Keys are hashed together with
+    ``scope`` (the destination webhook URL), so every tool posting to the
+    same table shares entries while other destinations stay separate in the
+    same file.
+    """
+
+    def __init__(
+        self,
+        path: os.PathLike,
+        ttl_days: float = DEFAULT_TTL_DAYS,
+        bloom: bool = False,
+        clock: Callable[[], float] = time.time,
+        scope: str = "",
+    ) -> None:
+        self.path = Path(path)
+        self.scope = f"{scope}|" if scope else ""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl_days * 86400
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sent ("
+            " digest BLOB PRIMARY KEY,"
+            " sent_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS sent_at ON sent (sent_at)")
+        self._db.commit()
+        self.expire()
+        self._bloom: Optional[BloomFilter] = None
+        if bloom:
+            self._load_bloom()
+
+    def _load_bloom(self) -> None:
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM sent").fetchone()[0]
+            # Room to double before the false-positive rate starts to climb.
+            self._bloom = BloomFilter(max(100000, count * 2))
+            for (digest,) in self._db.execute("SELECT digest FROM sent"):
+                self._bloom.add(digest)
+
+    def expire(self) -> int:
+        cutoff = self._clock() - self.ttl
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM sent WHERE sent_at < ?", (cutoff,))
+            self._db.commit()
+        return cursor.rowcount
+
+    def __contains__(self, key: str) -> bool:
+        return not self.filter_new([key])
+
+    def filter_new(self, keys: Iterable[str]) -> List[str]:
+        """The keys (in order) that are not in the index."""
+        keys = list(keys)
+        digests = {key: _digest(self.scope + key) for key in keys}
+        candidates = [
+            digests[key]
+            for key in keys
+            if self._bloom is None or digests[key] in self._bloom
+        ]
+        known = set()
+        cutoff = self._clock() - self.ttl
+        with self._lock:
+            for start in range(0, len(candidates), _QUERY_CHUNK):
+                chunk = candidates[start : start + _QUERY_CHUNK]
+                rows = self._db.execute(
+                    "SELECT digest FROM sent WHERE sent_at >= ? AND digest IN ({})".format(
+                        ",".join("?" * len(chunk))
+                    ),
+                    (cutoff, *chunk),
+                )
+                known.update(digest for (digest,) in rows)
+        return [key for key in keys if digests[key] not in known]
+
+    def add_many(self, keys: Iterable[str]) -> None:
+        now = self._clock()
+        digests = [_digest(self.scope + key) for key in keys]
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO sent (digest, sent_at) VALUES (?, ?)",
+                [(digest, now) for digest in digests],
+            )
+            self._db.commit()
+            if self._bloom is not None:
+                for digest in digests:
+                    self._bloom.add(digest)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM sent").fetchone()[0]
+        return {"keys": count, "bloom_bits": self._bloom.size if self._bloom else 0}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "DedupeIndex":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
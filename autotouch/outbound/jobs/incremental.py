@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from outbound.jobs.job_fetch import parse_posted_at
+
+# Jobs are often indexed some time after their posted_at, so each run looks
+# back this far past the high-water mark; emitted keys absorb the overlap.
+DEFAULT_OVERLAP = timedelta(hours=6)
+# Emitted keys are forgotten this long after they were sent, by which time
+# the job has aged out of every window that could return it.
+DEFAULT_RETENTION = timedelta(days=8)
+
+DATE_FILTER_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def filter_set_key(filters: Dict[str, Any]) -> str:
+    raw = json.dumps(filters, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class IncrementalState:
+    """High-water ``posted_at`` and emitted job keys for one filter set.
+
+    Stored as ``<directory>/<filter hash>.json``. ``date_filter()`` bounds the
+    next fetch; ``is_new()`` drops jobs already sent by an earlier run.
+    """
+
+    def __init__(
+        self,
+        directory: os.PathLike,
+        filters: Dict[str, Any],
+        overlap: timedelta = DEFAULT_OVERLAP,
+        retention: timedelta = DEFAULT_RETENTION,
+    ) -> None:
+        self.filters = filters
+        self.overlap = overlap
+        self.retention = retention
+        self.path = Path(directory) / f"{filter_set_key(filters)}.json"
+        self.high_water: Optional[datetime] = None
+        # Job key -> when it was emitted (ISO).
+        self.emitted: Dict[str, str] = {}
+        if self.path.exists():
+            data = json.loads(self.path.read_text())
+            self.high_water = parse_posted_at(data.get("high_water"))
+            self.emitted = dict(data.get("emitted") or {})
+
+    def date_filter(self) -> Optional[str]:
+        if self.high_water is None:
+            return None
+        since = (self.high_water - self.overlap).astimezone(timezone.utc)
+        return since.strftime(DATE_FILTER_FORMAT)
+
+    def is_new(self, key: str) -> bool:
+        return key not in self.emitted
+
+    def mark_emitted(self, records: Iterable[Dict[str, Any]]) -> None:
+        now = datetime.now(timezone.utc)
+        for record in records:
+            posted_at = parse_posted_at(record.get("posted_at"))
+            if posted_at is not None and (self.high_water is None or posted_at > self.high_water):
+                self.high_water = min(posted_at, now)
+            self.emitted[record["unknown_id"]] = now.isoformat()
+
+    def save(self) -> None:
+        cutoff = datetime.now(timezone.utc) - self.retention
+        emitted = {
+            key: seen
+            for key, seen in self.emitted.items()
+            if (parse_posted_at(seen) or cutoff) >= cutoff
+        }
+        data = {
+            "filters": self.filters,
+            "high_water": self.high_water.isoformat() if self.high_water else None,
+            "emitted": emitted,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, sort_keys=True, default=str))
+        os.replace(tmp, self.path)
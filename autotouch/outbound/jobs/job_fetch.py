@@ -1,18 +1,34 @@
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 from shared.integrations.rapidapi.jobs.active_jobs_db import RapidApiActiveJobsDbClient
 from shared.integrations.rapidapi.jobs.client import RapidApiLinkedInJobsClient
-
-ID_KEYS = (
-    "id",
-    "job_id",
-    "jobId",
-    "job_post_id",
-    "job_posting_id",
-    "posting_id",
-    "urn",
+from shared.integrations.rapidapi.metrics import MetricsRegistry, get_default_registry
+from shared.integrations.rapidapi.ratelimit import RateLimitExceeded
+from shared.integrations.rapidapi.retry import CircuitOpenError
+
+from outbound.jobs.content_index import content_hash
+from outbound.jobs.job_schema import (
+    GENERIC_SCHEMA,
+    ID_KEYS,
+    POSTED_AT_KEYS,
+    JobRecord,
+    JobSchema,
+    schema_for_job,
+    schema_for_jobs,
+)
+from outbound.jobs.keyword_plan import (
+    KeywordMatcher,
+    attribute_keywords,
+    build_description_filter,
+    plan_keyword_batches,
 )
 
+# A 24h view is only derived from a 7d response fetched this recently, so it
+# is no staler than a cached 24h response would be.
+DERIVE_24H_MAX_AGE = 15 * 60
+
 
 def pick(job: Dict[str, Any], *keys: str) -> Optional[Any]:
     for key in keys:
@@ -32,29 +48,19 @@ def extract_jobs(resp: Dict[str, Any]) -> List[Dict[str, Any]]:
     return []
 
 
-def job_key(job: Dict[str, Any]) -> str:
-    for key in ID_KEYS:
-        job_id = job.get(key)
-        if job_id:
-            return f"id:{str(job_id).strip().lower()}"
-    title = (pick(job, "job_title", "title") or "").strip().lower()
-    company = (
-        pick(job, "employer_name", "company_name", "organization") or ""
-    ).strip().lower()
-    location = (
-        pick(job, "job_city", "location", "job_location") or ""
-    ).strip().lower()
-    url = (
-        pick(job, "job_apply_link", "job_apply_url", "job_url", "job_link") or ""
-    ).strip().lower()
-    return url or f"{title}|{company}|{location}"
+def job_key(job: Union[Dict[str, Any], JobRecord], schema: Optional[JobSchema] = None) -> str:
+    if isinstance(job, JobRecord):
+        return job.key
+    return (schema or GENERIC_SCHEMA).key(job)
 
 
 def dedupe_jobs(jobs: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    jobs = list(jobs)
+    schema = schema_for_jobs(jobs)
     unique: Dict[str, Dict[str, Any]] = {}
     duplicates: List[Dict[str, Any]] = []
     for job in jobs:
-        key = job_key(job)
+        key = job_key(job, schema)
         if key in unique:
             duplicates.append(job)
         else:
@@ -62,21 +68,35 @@ def dedupe_jobs(jobs: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], L
     return list(unique.values()), duplicates
 
 
-def summarize_job(job: Dict[str, Any]) -> Dict[str, Any]:
+def summarize_job(job: Dict[str, Any], schema: Optional[JobSchema] = None) -> Dict[str, Any]:
+    fields = (schema or GENERIC_SCHEMA).fields
     return {
-        "title": pick(job, "job_title", "title"),
-        "company": pick(job, "employer_name", "company_name", "organization"),
-        "location": pick(job, "job_city", "location", "job_location"),
-        "url": pick(job, "job_apply_link", "job_apply_url", "job_url", "job_link"),
-        "posted_at": pick(
-            job,
-            "job_posted_at_datetime_utc",
-            "posted_at",
-            "date_posted",
-        ),
+        "title": fields["title"](job),
+        "company": fields["company"](job),
+        "location": fields["location"](job),
+        "url": fields["apply_url"](job),
+        "posted_at": fields["posted_at"](job),
     }
 
 
+def parse_posted_at(value: Any) -> Optional[datetime]:
+    if value in (None, ""):
+        return None
+    if isinstance(value, (int, float)):
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(seconds, tz=timezone.utc)
+    text = str(value).strip()
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
 def normalize_keywords(values: Iterable[str]) -> List[str]:
     keywords: List[str] = []
     for raw in values:
@@ -102,33 +122,116 @@ def _request_jobs(
     window: str,
     params: Dict[str, Any],
 ) -> Dict[str, Any]:
-    if window == "7d":
-        return client.get_jobs_7d(**params)
-    return client.get_jobs_24h(**params)
+    # Transient failures are already retried by the shared transport; an open
+    # circuit or exhausted quota surfaces as a failed envelope so the run
+    # moves on instead of waiting out the timeout on every keyword.
+    try:
+        if window == "7d":
+            return client.get_jobs_7d(**params)
+        return client.get_jobs_24h(**params)
+    except (CircuitOpenError, RateLimitExceeded) as exc:
+        return {"status": None, "headers": {}, "data": [], "error": str(exc)}
+
+
+def derive_24h_response(
+    client: Any,
+    params: Dict[str, Any],
+    max_age: float = DERIVE_24H_MAX_AGE,
+    now: Optional[datetime] = None,
+) -> Optional[Dict[str, Any]]:
+    """Build a 24h response from a fresh cached 7d response, without a request.
+
+    Returns None (so the caller queries ``/…-24h`` as usual) when no 7d
+    response for the same filters was cached within ``max_age`` seconds,
+    when any cached job has no parseable posted date, or when the 7d page
+    was full and is not confirmed newest-first past the 24h cutoff, since
+    the page may then be missing recent jobs.
+    """
+    cached = client.cached_jobs_7d(max_age=max_age, **params)
+    if cached is None or cached.get("status") not in (200, 201):
+        return None
+    jobs = extract_jobs(cached)
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(hours=24)
+    posted = [parse_posted_at(pick(job, *POSTED_AT_KEYS)) for job in jobs]
+    if any(value is None for value in posted):
+        return None
+    limit = params.get("limit")
+    if limit and len(jobs) >= limit:
+        newest_first = all(a >= b for a, b in zip(posted, posted[1:]))
+        if not newest_first or posted[-1] >= cutoff:
+            return None
+    recent = [job for job, value in zip(jobs, posted) if value >= cutoff]
+    return {
+        "status": cached["status"],
+        "headers": {**cached.get("headers", {}), "X-Derived-From": "7d"},
+        "data": recent,
+    }
 
 
-def fetch_jobs(
+def get_jobs_window(
+    client: Any,
+    window: str,
+    params: Dict[str, Any],
+    derive_24h: bool = False,
+) -> Dict[str, Any]:
+    if window == "24h" and derive_24h:
+        derived = derive_24h_response(client, params)
+        if derived is not None:
+            return derived
+    return _request_jobs(client, window, params)
+
+
+def iter_source_jobs(
+    client: Any,
+    label: str,
+    window: str,
+    params: Dict[str, Any],
+    derive_24h: bool = False,
+    max_items: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield one source's jobs: a single ``limit`` page, or pages up to ``max_items``."""
+    limit = params.get("limit")
+    if max_items is None or (limit and max_items <= limit):
+        resp = get_jobs_window(client, window, params, derive_24h)
+        if resp.get("status") not in (200, 201):
+            status = resp.get("error") or resp.get("status")
+            print(f"{label} {window} request failed: {status}")
+        yield from extract_jobs(resp)[:max_items]
+        return
+    filters = {k: v for k, v in params.items() if k != "limit"}
+    try:
+        yield from client.iter_jobs(
+            window=window, page_size=limit or 100, max_items=max_items, **filters
+        )
+    except RuntimeError as exc:
+        # Failed pages, open circuits and exhausted quotas all land here;
+        # keep what was already yielded and move on.
+        print(f"{label} {window} request failed: {exc}")
+
+
+FetchTask = Tuple[str, str, Any, Dict[str, Any], List[str]]
+
+
+def plan_fetch_tasks(
     linkedin_client: RapidApiLinkedInJobsClient,
     active_client: RapidApiActiveJobsDbClient,
-    window: str,
     title_filter: Optional[str],
     keywords: List[str],
     employees_lte: Optional[int],
     employees_gte: Optional[int],
     limit: int,
-) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Set[str]], Dict[str, Set[str]]]:
-    jobs_by_key: Dict[str, Dict[str, Any]] = {}
-    sources_by_key: Dict[str, Set[str]] = {}
-    keywords_by_key: Dict[str, Set[str]] = {}
-
-    def add_job(job: Dict[str, Any], source: str, keyword: Optional[str]) -> None:
-        key = job_key(job)
-        if key not in jobs_by_key:
-            jobs_by_key[key] = job
-        sources_by_key.setdefault(key, set()).add(source)
-        if keyword:
-            keywords_by_key.setdefault(key, set()).add(keyword)
-
+    batch_keywords: bool = False,
+    date_filter: Optional[str] = None,
+    local_keywords: bool = False,
+) -> List[FetchTask]:
+    """One ``(source, label, client, params, keyword batch)`` per batch x source.
+
+    Each task gets its own params dict so tasks can run concurrently without
+    sharing mutable state. Without ``batch_keywords`` every batch holds a
+    single keyword. With ``local_keywords`` there is one task per source
+    carrying every keyword but no ``description_filter``; its jobs are
+    tagged locally and dropped when they match none.
+    """
     linkedin_params = {
         "limit": limit,
         "offset": 0,
@@ -136,6 +239,7 @@ def fetch_jobs(
         "description_type": "text",
         "employees_lte": employees_lte,
         "employees_gte": employees_gte,
+        "date_filter": date_filter,
     }
     active_params = {
         "limit": limit,
@@ -144,124 +248,180 @@ def fetch_jobs(
         "description_type": "text",
         "li_organization_employees_lte": employees_lte,
         "li_organization_employees_gte": employees_gte,
+        "date_filter": date_filter,
     }
 
-    keyword_list: List[Optional[str]] = keywords or [None]
-    for keyword in keyword_list:
-        if keyword:
-            linkedin_params["description_filter"] = keyword
-            active_params["description_filter"] = keyword
-        else:
-            linkedin_params.pop("description_filter", None)
-            active_params.pop("description_filter", None)
-
-        linkedin_resp = _request_jobs(linkedin_client, window, linkedin_params)
-        if linkedin_resp.get("status") not in (200, 201):
-            status = linkedin_resp.get("status")
-            print(f"LinkedIn jobs {window} request failed: {status}")
-        for job in extract_jobs(linkedin_resp):
-            add_job(job, "linkedin", keyword)
-
-        active_resp = _request_jobs(active_client, window, active_params)
-        if active_resp.get("status") not in (200, 201):
-            status = active_resp.get("status")
-            print(f"Active jobs {window} request failed: {status}")
-        for job in extract_jobs(active_resp):
-            add_job(job, "active_jobs_db", keyword)
+    if not keywords:
+        batches: List[List[str]] = [[]]
+    elif local_keywords:
+        batches = [list(keywords)]
+    elif batch_keywords:
+        batches = plan_keyword_batches(keywords)
+    else:
+        batches = [[keyword] for keyword in keywords]
+    tasks: List[FetchTask] = []
+    for batch in batches:
+        for source, label, client, base_params in (
+            ("linkedin", "LinkedIn jobs", linkedin_client, linkedin_params),
+            ("active_jobs_db", "Active jobs", active_client, active_params),
+        ):
+            params = dict(base_params)
+            if batch and not local_keywords:
+                params["description_filter"] = build_description_filter(batch)
+            tasks.append((source, label, client, params, batch))
+    return tasks
+
+
+def iter_task_jobs(
+    task: FetchTask,
+    window: str,
+    derive_24h: bool = False,
+    max_items: Optional[int] = None,
+    keep_raw: bool = False,
+    matcher: Optional[KeywordMatcher] = None,
+    metrics: Optional[MetricsRegistry] = None,
+) -> Iterator[Tuple[JobRecord, List[str]]]:
+    """Yield ``(JobRecord, matched keywords)`` for one task as pages arrive.
+
+    A task with keywords but no ``description_filter`` is a local-keywords
+    fetch: only jobs matching at least one keyword are yielded.
+    """
+    source, label, client, params, batch = task
+    local = bool(batch) and "description_filter" not in params
+    matcher = matcher or KeywordMatcher(batch)
+    metrics = metrics or get_default_registry()
+    keyword = f"local ({len(batch)} keywords)" if local else ", ".join(batch)
+    with metrics.timer("fetch_jobs", source=source, window=window, keyword=keyword) as counter:
+        for raw in iter_source_jobs(client, label, window, params, derive_24h, max_items):
+            job = schema_for_job(raw).record(raw, keep_raw)
+            counter["items"] += 1
+            matched = attribute_keywords(job, batch, matcher, local)
+            if local and not matched:
+                continue
+            yield job, matched
+
+
+def fetch_jobs(
+    linkedin_client: RapidApiLinkedInJobsClient,
+    active_client: RapidApiActiveJobsDbClient,
+    window: str,
+    title_filter: Optional[str],
+    keywords: List[str],
+    employees_lte: Optional[int],
+    employees_gte: Optional[int],
+    limit: int,
+    derive_24h: bool = False,
+    max_items: Optional[int] = None,
+    metrics: Optional[MetricsRegistry] = None,
+    workers: int = 1,
+    batch_keywords: bool = False,
+    date_filter: Optional[str] = None,
+    keep_raw: bool = False,
+    local_keywords: bool = False,
+) -> Tuple[Dict[str, JobRecord], Dict[str, Set[str]], Dict[str, Set[str]]]:
+    """Fetch, dedupe and attribute jobs across sources and keywords.
+
+    Jobs are reduced to ``JobRecord``s as each page is parsed; pass
+    ``keep_raw=True`` to keep the API payload on ``JobRecord.raw``. With
+    ``local_keywords`` each source is queried once without a description
+    filter and keywords are matched locally (see ``plan_fetch_tasks``).
+    """
+    metrics = metrics or get_default_registry()
+    jobs_by_key: Dict[str, JobRecord] = {}
+    sources_by_key: Dict[str, Set[str]] = {}
+    keywords_by_key: Dict[str, Set[str]] = {}
+
+    def add_job(job: JobRecord, source: str, keywords: List[str]) -> None:
+        key = job.key
+        if key not in jobs_by_key:
+            jobs_by_key[key] = job
+        sources_by_key.setdefault(key, set()).add(source)
+        if keywords:
+            keywords_by_key.setdefault(key, set()).update(keywords)
+
+    tasks = plan_fetch_tasks(
+        linkedin_client,
+        active_client,
+        title_filter,
+        keywords,
+        employees_lte,
+        employees_gte,
+        limit,
+        batch_keywords=batch_keywords,
+        date_filter=date_filter,
+        local_keywords=local_keywords,
+    )
+    matchers = {batch: KeywordMatcher(batch) for batch in {tuple(task[4]) for task in tasks}}
+
+    def run_task(task: FetchTask) -> List[Tuple[JobRecord, List[str]]]:
+        return list(
+            iter_task_jobs(
+                task, window, derive_24h, max_items, keep_raw, matchers[tuple(task[4])], metrics
+            )
+        )
+
+    # Results are merged on this thread in task order, so the output is the
+    # same as a serial run regardless of which request finishes first.
+    if workers > 1 and len(tasks) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            results: Iterable[List[Tuple[JobRecord, List[str]]]] = list(
+                executor.map(run_task, tasks)
+            )
+    else:
+        results = map(run_task, tasks)
+    for (source, _, _, _, _), jobs in zip(tasks, results):
+        for job, matched in jobs:
+            add_job(job, source, matched)
 
     return jobs_by_key, sources_by_key, keywords_by_key
 
 
 def build_record(
     key: str,
-    job: Dict[str, Any],
+    job: Union[Dict[str, Any], JobRecord],
     sources: Set[str],
     keywords: Set[str],
     window: str,
     employees_lte: Optional[int],
     employees_gte: Optional[int],
+    schema: Optional[JobSchema] = None,
 ) -> Dict[str, Any]:
-    company_domain = pick(
-        job,
-        "company_domain",
-        "organization_domain",
-        "employer_domain",
-        "domain",
-    )
-    website = pick(
-        job,
-        "company_website",
-        "organization_website",
-        "employer_website",
-        "company_url",
-        "organization_url",
-        "website",
-        "url",
-        "company_link",
-        "employer_link",
-        "company_domain",
-        "organization_domain",
-        "employer_domain",
-        "domain",
-    )
+    """Build the webhook row for a ``JobRecord`` or a raw job dict.
+
+    ``content_hash`` covers the job's own fields, not the run's window,
+    employee bounds, keywords or sources (see ``content_index``). For raw
+    dicts, ``schema`` should cover the job's keys (see ``schema_for_jobs``).
+    """
+    if not isinstance(job, JobRecord):
+        job = (schema or GENERIC_SCHEMA).record(job, key=key)
+    company_domain = job.company_domain
+    website = job.website
     if isinstance(website, str) and website and not website.startswith(("http://", "https://")):
         website = f"https://{website}"
 
-    company_linkedin_url = pick(
-        job,
-        "organization_url",
-        "linkedin_org_url",
-        "company_linkedin_url",
-        "company_linkedin",
-        "linkedin_url",
-    )
-    job_url = pick(
-        job,
-        "job_apply_link",
-        "job_apply_url",
-        "job_url",
-        "job_link",
-        "external_apply_url",
-        "url",
-    )
-    external_apply_url = pick(job, "external_apply_url")
+    company_linkedin_url = job.company_linkedin_url
+    job_url = job.job_url
+    external_apply_url = job.external_apply_url
     if isinstance(job_url, str) and job_url and not job_url.startswith(("http://", "https://")):
         job_url = f"https://{job_url}"
     if isinstance(external_apply_url, str) and external_apply_url and not external_apply_url.startswith(("http://", "https://")):
         external_apply_url = f"https://{external_apply_url}"
 
-    job_description = pick(
-        job,
-        "description",
-        "job_description",
-        "description_text",
-        "description_raw",
-    )
-
-    employment_type = pick(job, "employment_type", "job_employment_type")
-    seniority = pick(job, "seniority", "job_seniority")
-    remote = pick(job, "remote_derived", "remote")
-
     record = {
         "unknown_id": key,
-        "job_title": pick(job, "job_title", "title"),
-        "company": pick(job, "employer_name", "company_name", "organization"),
-        "location": pick(job, "job_city", "location", "job_location"),
+        "job_title": job.title,
+        "company": job.company,
+        "location": job.location,
         "job_url": job_url,
         "external_apply_url": external_apply_url,
-        "posted_at": pick(
-            job,
-            "job_posted_at_datetime_utc",
-            "posted_at",
-            "date_posted",
-        ),
+        "posted_at": job.posted_at,
         "website": website,
         "company_domain": company_domain,
         "company_linkedin_url": company_linkedin_url,
-        "job_description": job_description,
-        "employment_type": employment_type,
-        "seniority": seniority,
-        "remote": remote,
+        "job_description": job.job_description,
+        "employment_type": job.employment_type,
+        "seniority": job.seniority,
+        "remote": job.remote,
         "sources": ", ".join(sorted(sources)),
         "keywords": ", ".join(sorted(keywords)),
         "window": window,
@@ -271,15 +431,9 @@ def build_record(
     if employees_gte is not None:
         record["employees_gte"] = employees_gte
 
-    employee_fields = (
-        "company_employee_count",
-        "company_size",
-        "organization_num_employees",
-        "organization_employees",
-        "employees",
-    )
-    employee_value = pick(job, *employee_fields)
+    employee_value = job.company_employee_count
     if employee_value is not None:
         record["company_employee_count"] = employee_value
 
+    record["content_hash"] = content_hash(record)
     return record
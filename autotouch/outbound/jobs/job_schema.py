@@ -0,0 +1,233 @@
+import threading
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+ID_KEYS = (
+    "id",
+    "job_id",
+    "jobId",
+    "job_post_id",
+    "job_posting_id",
+    "posting_id",
+    "urn",
+)
+
+POSTED_AT_KEYS = ("job_posted_at_datetime_utc", "posted_at", "date_posted")
+
+# Output field -> candidate job keys, in priority order. LinkedIn Jobs,
+# Active Jobs DB and JSearch each populate a different subset.
+FIELDS: Dict[str, Tuple[str, ...]] = {
+    "title": ("job_title", "title"),
+    "company": ("employer_name", "company_name", "organization"),
+    "location": ("job_city", "location", "job_location"),
+    "apply_url": ("job_apply_link", "job_apply_url", "job_url", "job_link"),
+    "job_url": (
+        "job_apply_link",
+        "job_apply_url",
+        "job_url",
+        "job_link",
+        "external_apply_url",
+        "url",
+    ),
+    "external_apply_url": ("external_apply_url",),
+    "posted_at": POSTED_AT_KEYS,
+    "company_domain": (
+        "company_domain",
+        "organization_domain",
+        "employer_domain",
+        "domain",
+    ),
+    "website": (
+        "company_website",
+        "organization_website",
+        "employer_website",
+        "company_url",
+        "organization_url",
+        "website",
+        "url",
+        "company_link",
+        "employer_link",
+        "company_domain",
+        "organization_domain",
+        "employer_domain",
+        "domain",
+    ),
+    "company_linkedin_url": (
+        "organization_url",
+        "linkedin_org_url",
+        "company_linkedin_url",
+        "company_linkedin",
+        "linkedin_url",
+    ),
+    "job_description": (
+        "description",
+        "job_description",
+        "description_text",
+        "description_raw",
+    ),
+    "employment_type": ("employment_type", "job_employment_type"),
+    "seniority": ("seniority", "job_seniority"),
+    "remote": ("remote_derived", "remote"),
+    "company_employee_count": (
+        "company_employee_count",
+        "company_size",
+        "organization_num_employees",
+        "organization_employees",
+        "employees",
+    ),
+}
+
+RECORD_FIELDS = tuple(FIELDS)
+
+Accessor = Callable[[Dict[str, Any]], Optional[Any]]
+
+MAX_CACHED_SCHEMAS = 256
+
+
+def _none(job: Dict[str, Any]) -> None:
+    return None
+
+
+def _compile(keys: Tuple[str, ...]) -> Accessor:
+    """Accessor with ``pick`` semantics over ``keys``: first non-empty value."""
+    if not keys:
+        return _none
+    if len(keys) == 1:
+        (only,) = keys
+
+        def get_one(job: Dict[str, Any]) -> Optional[Any]:
+            value = job.get(only)
+            return None if value in (None, "", []) else value
+
+        return get_one
+
+    def get_first(job: Dict[str, Any]) -> Optional[Any]:
+        for key in keys:
+            value = job.get(key)
+            if value not in (None, "", []):
+                return value
+        return None
+
+    return get_first
+
+
+def _compile_id(keys: Tuple[str, ...]) -> Accessor:
+    """Accessor for ``job_key``'s id lookup: first truthy value."""
+    if not keys:
+        return _none
+
+    def get_id(job: Dict[str, Any]) -> Optional[Any]:
+        for key in keys:
+            value = job.get(key)
+            if value:
+                return value
+        return None
+
+    return get_id
+
+
+class JobRecord:
+    """The fields the pipeline reads from one job, plus its dedupe key.
+
+    Built while pages are parsed so the raw payload (AI/organization fields,
+    HTML descriptions, ...) can be dropped at once; ``raw`` keeps it only
+    when asked to.
+    """
+
+    __slots__ = ("key",) + RECORD_FIELDS + ("raw",)
+
+    def __init__(self, key: str, values: List[Any], raw: Optional[Dict[str, Any]] = None) -> None:
+        self.key = key
+        for name, value in zip(RECORD_FIELDS, values):
+            setattr(self, name, value)
+        self.raw = raw
+
+    def get(self, field: str) -> Optional[Any]:
+        return getattr(self, field)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in RECORD_FIELDS}
+
+    def __repr__(self) -> str:
+        return f"JobRecord({self.key!r}, title={self.title!r}, company={self.company!r})"
+
+
+class JobSchema:
+    """Field accessors compiled for the keys one source's jobs actually carry.
+
+    Candidates absent from every job are dropped up front, so most fields
+    become a single ``dict.get``. Results are identical to ``pick`` over the
+    full candidate list as long as each job's keys are within ``keys``.
+    """
+
+    def __init__(self, keys: Optional[Iterable[str]] = None) -> None:
+        present = None if keys is None else frozenset(keys)
+
+        def narrow(candidates: Tuple[str, ...]) -> Tuple[str, ...]:
+            if present is None:
+                return candidates
+            return tuple(key for key in candidates if key in present)
+
+        self.job_id = _compile_id(narrow(ID_KEYS))
+        self.fields: Dict[str, Accessor] = {
+            name: _compile(narrow(candidates)) for name, candidates in FIELDS.items()
+        }
+        self._accessors = [self.fields[name] for name in RECORD_FIELDS]
+
+    def get(self, job: Dict[str, Any], field: str) -> Optional[Any]:
+        return self.fields[field](job)
+
+    def key(self, job: Dict[str, Any]) -> str:
+        job_id = self.job_id(job)
+        if job_id:
+            return f"id:{str(job_id).strip().lower()}"
+        fields = self.fields
+        title = (fields["title"](job) or "").strip().lower()
+        company = (fields["company"](job) or "").strip().lower()
+        location = (fields["location"](job) or "").strip().lower()
+        url = (fields["apply_url"](job) or "").strip().lower()
+        return url or f"{title}|{company}|{location}"
+
+    def record(
+        self, job: Dict[str, Any], keep_raw: bool = False, key: Optional[str] = None
+    ) -> JobRecord:
+        return JobRecord(
+            self.key(job) if key is None else key,
+            [accessor(job) for accessor in self._accessors],
+            job if keep_raw else None,
+        )
+
+
+# Used when no schema is given: every candidate, i.e. plain ``pick``.
+GENERIC_SCHEMA = JobSchema()
+
+_schemas: Dict[FrozenSet[str], JobSchema] = {}
+_job_schemas: Dict[Tuple[str, ...], JobSchema] = {}
+_schemas_lock = threading.Lock()
+
+
+def schema_for_jobs(jobs: Iterable[Dict[str, Any]]) -> JobSchema:
+    """Compile (or reuse) the schema for the union of keys across ``jobs``."""
+    keys: set = set()
+    for job in jobs:
+        keys.update(job)
+    keyset = frozenset(keys)
+    with _schemas_lock:
+        schema = _schemas.get(keyset)
+        if schema is None:
+            if len(_schemas) >= MAX_CACHED_SCHEMAS:
+                _schemas.clear()
+            schema = _schemas[keyset] = JobSchema(keyset)
+    return schema
+
+
+def schema_for_job(job: Dict[str, Any]) -> JobSchema:
+    """Schema for one job, cached by its key sequence (stable per source)."""
+    signature = tuple(job)
+    schema = _job_schemas.get(signature)
+    if schema is None:
+        schema = schema_for_jobs([job])
+        with _schemas_lock:
+            if len(_job_schemas) >= MAX_CACHED_SCHEMAS:
+                _job_schemas.clear()
+            _job_schemas[signature] = schema
+    return schema
@@ -0,0 +1,155 @@
+import re
+import urllib.parse
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from outbound.jobs.job_schema import JobRecord
+from outbound.shared.job_titles import to_or_query
+
+# description_filter accepts the same OR syntax as title_filter. Keep each
+# expression well below typical URL limits once the other filters are added.
+MAX_FILTER_CHARS = 800
+MAX_KEYWORDS_PER_QUERY = 10
+
+DESCRIPTION_KEYS = ("description", "job_description", "description_text", "description_raw")
+TITLE_KEYS = ("job_title", "title")
+
+
+def build_description_filter(keywords: List[str]) -> str:
+    # A lone keyword is sent as typed, exactly as before batching existed.
+    if len(keywords) == 1:
+        return keywords[0]
+    return to_or_query(keyword.replace('"', " ") for keyword in keywords)
+
+
+def _encoded_length(expression: str) -> int:
+    return len(urllib.parse.quote_plus(expression))
+
+
+def plan_keyword_batches(
+    keywords: List[str],
+    max_filter_chars: int = MAX_FILTER_CHARS,
+    max_keywords: int = MAX_KEYWORDS_PER_QUERY,
+) -> List[List[str]]:
+    """Pack keywords, in order, into OR batches under the encoded length cap.
+
+    A keyword that is too long on its own still gets a batch of one.
+    """
+    batches: List[List[str]] = []
+    current: List[str] = []
+    for keyword in keywords:
+        candidate = current + [keyword]
+        if current and (
+            len(candidate) > max_keywords
+            or _encoded_length(build_description_filter(candidate)) > max_filter_chars
+        ):
+            batches.append(current)
+            candidate = [keyword]
+        current = candidate
+    if current:
+        batches.append(current)
+    return batches
+
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_PLURAL_SUFFIXES = ("s", "es")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class KeywordMatcher:
+    """Finds which keywords occur in a job's title or description.
+
+    Matching is case-insensitive on word boundaries and tolerates a plural
+    suffix, approximating the APIs' full-text matching. Keywords compile
+    into one Aho-Corasick automaton over word tokens, so a text is scanned
+    once however many keywords there are; tokens that appear in no keyword
+    reset the automaton without a lookup in its transitions.
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.keywords = list(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[Tuple[int, ...]] = [()]
+        for index, keyword in enumerate(self.keywords):
+            tokens = tokenize(keyword)
+            if not tokens:
+                continue
+            self._add(tokens, index)
+            if tokens[-1][-1].isalnum():
+                for suffix in _PLURAL_SUFFIXES:
+                    self._add(tokens[:-1] + [tokens[-1] + suffix], index)
+        self._vocabulary = {token for edges in self._goto for token in edges}
+        self._build_failure_links()
+
+    def _add(self, tokens: List[str], index: int) -> None:
+        state = 0
+        for token in tokens:
+            edges = self._goto[state]
+            if token not in edges:
+                edges[token] = len(self._goto)
+                self._goto.append({})
+                self._output.append(())
+            state = edges[token]
+        if index not in self._output[state]:
+            self._output[state] += (index,)
+
+    def _build_failure_links(self) -> None:
+        goto, output = self._goto, self._output
+        self._fail = fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in goto[state].items():
+                queue.append(child)
+                fallback = fail[state]
+                while fallback and token not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[child] = goto[fallback].get(token, 0)
+                output[child] += tuple(i for i in output[fail[child]] if i not in output[child])
+
+    def match(self, text: str) -> List[str]:
+        if not text or not self.keywords:
+            return []
+        goto, fail, output, vocabulary = self._goto, self._fail, self._output, self._vocabulary
+        found: Set[int] = set()
+        state = 0
+        for token in tokenize(text):
+            if token not in vocabulary:
+                state = 0
+                continue
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if output[state]:
+                found.update(output[state])
+        return [self.keywords[index] for index in sorted(found)]
+
+
+def job_text(job: Union[Dict[str, Any], JobRecord]) -> str:
+    if isinstance(job, JobRecord):
+        parts = [job.title, job.job_description]
+    else:
+        parts = [job.get(key) for key in TITLE_KEYS + DESCRIPTION_KEYS]
+    return "\n".join(part for part in parts if isinstance(part, str) and part)
+
+
+def attribute_keywords(
+    job: Union[Dict[str, Any], JobRecord],
+    batch: List[str],
+    matcher: Optional[KeywordMatcher] = None,
+    local: bool = False,
+) -> List[str]:
+    """Keywords from ``batch`` that ``job`` matched.
+
+    Falls back to the whole batch when no keyword is found locally (e.g. the
+    API matched a stemmed form), since the job did match one of them. With
+    ``local`` the API did not filter on ``batch`` at all, so there is no
+    fallback and an empty list means the job matched none.
+    """
+    if len(batch) == 1 and not local:
+        return list(batch)
+    matched = (matcher or KeywordMatcher(batch)).match(job_text(job))
+    return matched if local else matched or list(batch)
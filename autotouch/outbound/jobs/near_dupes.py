@@ -0,0 +1,195 @@
+import re
+import zlib
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from outbound.jobs.job_schema import GENERIC_SCHEMA, JobRecord
+
+NUM_HASHES = 64
+BANDS = 16
+DEFAULT_THRESHOLD = 0.8
+# Descriptions outweigh the few title/company features, so two roles at one
+# employer share most shingles; merged jobs must also pass these checks.
+TITLE_THRESHOLD = 0.5
+# Only the start of a description is shingled; syndicated copies diverge (if
+# at all) in boilerplate appended at the end.
+DESCRIPTION_WORDS = 300
+
+_NON_WORD = re.compile(r"[^\w]+")
+# Tracking/legal suffixes that differ between syndicated copies.
+_COMPANY_SUFFIXES = {"inc", "llc", "ltd", "gmbh", "corp", "co", "corporation", "limited", "plc"}
+_EMPTY = 0xFFFFFFFF
+
+
+def normalize(text: Optional[Any]) -> List[str]:
+    if not isinstance(text, str):
+        return []
+    return [word for word in _NON_WORD.split(text.lower()) if word]
+
+
+def _fields(job: Union[Dict[str, Any], JobRecord]) -> Tuple[Any, Any, Any]:
+    if isinstance(job, JobRecord):
+        return job.title, job.company, job.job_description
+    fields = GENERIC_SCHEMA.fields
+    return fields["title"](job), fields["company"](job), fields["job_description"](job)
+
+
+def _company(company: Any) -> Tuple[str, ...]:
+    return tuple(word for word in normalize(company) if word not in _COMPANY_SUFFIXES)
+
+
+def _role(job: Union[Dict[str, Any], JobRecord]) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+    """Title words and normalized company, compared before two jobs merge."""
+    title, company, _ = _fields(job)
+    return frozenset(normalize(title)), _company(company)
+
+
+def same_role(
+    a: Tuple[FrozenSet[str], Tuple[str, ...]],
+    b: Tuple[FrozenSet[str], Tuple[str, ...]],
+    title_threshold: float = TITLE_THRESHOLD,
+) -> bool:
+    """Same company and title word Jaccard of at least ``title_threshold``."""
+    (title_a, company_a), (title_b, company_b) = a, b
+    if company_a != company_b:
+        return False
+    union = title_a | title_b
+    return not union or len(title_a & title_b) / len(union) >= title_threshold
+
+
+def _hashes(features: Iterable[str]) -> Iterator[int]:
+    return map(zlib.crc32, map(str.encode, features))
+
+
+def shingles(job: Union[Dict[str, Any], JobRecord]) -> Set[int]:
+    """Hashed title and company words plus word 3-grams of the description."""
+    title, company, description = _fields(job)
+    features = set(_hashes("t:" + word for word in normalize(title)))
+    features.update(_hashes("c:" + word for word in _company(company)))
+    words = normalize(description)[:DESCRIPTION_WORDS]
+    features.update(_hashes(map(" ".join, zip(words, words[1:], words[2:]))))
+    return features
+
+
+def signature(features: Set[int], num_hashes: int = NUM_HASHES) -> Tuple[int, ...]:
+    """One-permutation MinHash: each feature hash falls into one of
+    ``num_hashes`` bins and each bin keeps its minimum; empty bins borrow
+    from the next non-empty one so sparse sets still compare bin for bin.
+    """
+    if not features:
+        return (_EMPTY,) * num_hashes
+    # Descending order, so the smallest value per bin is written last.
+    bins = {value % num_hashes: value // num_hashes for value in sorted(features, reverse=True)}
+    filled = []
+    for i in range(num_hashes):
+        step = 0
+        while (i + step) % num_hashes not in bins:
+            step += 1
+        value = bins[(i + step) % num_hashes]
+        if step:
+            # Rehash borrowed values, seeded by the step, so they only match
+            # the same borrowing and stay within 32 bits.
+            value = zlib.crc32(value.to_bytes(4, "little"), step)
+        filled.append(value)
+    return tuple(filled)
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class _UnionFind:
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # The earlier job stays the root, so it represents the cluster.
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def find_near_duplicates(
+    jobs: Dict[str, Union[Dict[str, Any], JobRecord]],
+    threshold: float = DEFAULT_THRESHOLD,
+    num_hashes: int = NUM_HASHES,
+    bands: int = BANDS,
+    title_threshold: float = TITLE_THRESHOLD,
+) -> List[List[str]]:
+    """Group keys of jobs whose estimated Jaccard similarity is >= ``threshold``.
+
+    LSH banding keeps this near-linear: only jobs sharing a whole band are
+    compared. A pair merges only if ``same_role`` also holds, so different
+    roles with the same employer boilerplate stay apart. Each returned
+    cluster lists its keys in input order, so the first one is the job that
+    was seen first.
+    """
+    keys = list(jobs)
+    signatures = [signature(shingles(jobs[key]), num_hashes) for key in keys]
+    roles = [_role(jobs[key]) for key in keys]
+    rows = num_hashes // bands
+    union = _UnionFind(len(keys))
+    for band in range(bands):
+        buckets: Dict[Tuple[int, ...], List[int]] = {}
+        start = band * rows
+        for index, sig in enumerate(signatures):
+            buckets.setdefault(sig[start : start + rows], []).append(index)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            # Compare each member with the bucket's distinct anchors rather
+            # than every other member, so a hot bucket stays cheap.
+            anchors: List[int] = []
+            for index in members:
+                for anchor in anchors:
+                    if union.find(anchor) == union.find(index) or (
+                        similarity(signatures[anchor], signatures[index]) >= threshold
+                        and same_role(roles[anchor], roles[index], title_threshold)
+                    ):
+                        union.union(anchor, index)
+                        break
+                else:
+                    anchors.append(index)
+    clusters: Dict[int, List[str]] = {}
+    for index, key in enumerate(keys):
+        clusters.setdefault(union.find(index), []).append(key)
+    return [members for members in clusters.values() if len(members) > 1]
+
+
+def merge_near_duplicates(
+    jobs_by_key: Dict[str, Any],
+    sources_by_key: Dict[str, Set[str]],
+    keywords_by_key: Dict[str, Set[str]],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """Fold each near-duplicate cluster into its first job, in place.
+
+    The kept job inherits the sources and keywords of the ones dropped.
+    Returns one report entry per merged cluster.
+    """
+    report: List[Dict[str, Any]] = []
+    for kept, *dropped in find_near_duplicates(jobs_by_key, threshold):
+        members = []
+        for key in [kept] + dropped:
+            title, company, _ = _fields(jobs_by_key[key])
+            members.append(
+                {
+                    "key": key,
+                    "title": title,
+                    "company": company,
+                    "sources": sorted(sources_by_key.get(key, ())),
+                }
+            )
+        report.append({"kept": kept, "merged": dropped, "jobs": members})
+        for key in dropped:
+            sources_by_key.setdefault(kept, set()).update(sources_by_key.pop(key, set()))
+            merged = keywords_by_key.pop(key, set())
+            if merged:
+                keywords_by_key.setdefault(kept, set()).update(merged)
+            del jobs_by_key[key]
+    return report
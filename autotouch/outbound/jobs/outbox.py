@@ -0,0 +1,128 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Set, Tuple
+
+from outbound.jobs.webhook import encode_record
+
+DEFAULT_SEGMENT_BYTES = 16 * 1024 * 1024
+
+_CURSOR = "cursor.json"
+_SEGMENT_SUFFIX = ".jsonl"
+
+
+def _runs(numbers: Set[int]) -> List[List[int]]:
+    """``numbers`` as sorted ``[first, last]`` runs."""
+    runs: List[List[int]] = []
+    for number in sorted(numbers):
+        if runs and runs[-1][1] == number - 1:
+            runs[-1][1] = number
+        else:
+            runs.append([number, number])
+    return runs
+
+
+def _sync_close(handle: BinaryIO) -> None:
+    handle.flush()
+    os.fsync(handle.fileno())
+    handle.close()
+
+
+class Outbox:
+    """Append-only spool of webhook records with a delivery cursor.
+
+    Records are numbered in append order and written as JSON lines to
+    segment files named after their first number (a new segment starts
+    once one passes ``segment_bytes``). ``cursor.json`` holds the number of
+    the first record not yet delivered. Batches may land out of order, so
+    the cursor only moves over a contiguous delivered run; records delivered
+    past it are kept in ``cursor.json`` as runs and skipped by ``pending``,
+    so only the undelivered ones are resent. A batch that lands just before
+    a crash is resent, which the upserting ingest absorbs. Segments wholly
+    behind the cursor are deleted. A torn last line (a crash while
+    appending) is dropped on open.
+    """
+
+    def __init__(self, directory: os.PathLike, segment_bytes: int = DEFAULT_SEGMENT_BYTES) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self._cursor_path = self.directory / _CURSOR
+        self.next = 0
+        self._acked: Set[int] = set()
+        if self._cursor_path.exists():
+            cursor = json.loads(self._cursor_path.read_text())
+            self.next = cursor["next"]
+            for first, last in cursor.get("acked", []):
+                self._acked.update(range(first, last + 1))
+        self._segments = sorted(
+            int(path.stem) for path in self.directory.glob(f"*{_SEGMENT_SUFFIX}")
+        )
+        self.end = self._recover()
+
+    def _segment_path(self, start: int) -> Path:
+        return self.directory / f"{start:012d}{_SEGMENT_SUFFIX}"
+
+    def _recover(self) -> int:
+        if not self._segments:
+            return self.next
+        start = self._segments[-1]
+        path = self._segment_path(start)
+        data = path.read_bytes()
+        complete = data[: data.rfind(b"\n") + 1]
+        if len(complete) != len(data):
+            with path.open("r+b") as handle:
+                handle.truncate(len(complete))
+        return max(self.next, start + complete.count(b"\n"))
+
+    def __len__(self) -> int:
+        """Records appended but not yet delivered."""
+        return self.end - self.next - len(self._acked)
+
+    def append(self, records: Iterable[Dict[str, Any]]) -> List[int]:
+        """Durably spool ``records``; returns their numbers."""
+        numbers: List[int] = []
+        if not self._segments or self._segment_path(self._segments[-1]).stat().st_size >= self.segment_bytes:
+            self._segments.append(self.end)
+        handle = self._segment_path(self._segments[-1]).open("ab")
+        try:
+            for record in records:
+                handle.write(encode_record(record) + b"\n")
+                numbers.append(self.end)
+                self.end += 1
+                if handle.tell() >= self.segment_bytes:
+                    _sync_close(handle)
+                    self._segments.append(self.end)
+                    handle = self._segment_path(self.end).open("ab")
+        finally:
+            _sync_close(handle)
+        return numbers
+
+    def pending(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """``(number, record)`` for every undelivered record, in order."""
+        pending: List[Tuple[int, Dict[str, Any]]] = []
+        for position, start in enumerate(self._segments):
+            following = self._segments[position + 1] if position + 1 < len(self._segments) else self.end
+            if following <= self.next:
+                continue
+            with self._segment_path(start).open("rb") as handle:
+                for number, line in enumerate(handle, start):
+                    if number >= self.next and number not in self._acked:
+                        pending.append((number, json.loads(line)))
+        return pending
+
+    def ack(self, numbers: Iterable[int]) -> None:
+        """Mark records delivered and move the cursor over any contiguous run."""
+        numbers = {number for number in numbers if number >= self.next} - self._acked
+        if not numbers:
+            return
+        self._acked.update(numbers)
+        while self.next in self._acked:
+            self._acked.discard(self.next)
+            self.next += 1
+        tmp = self._cursor_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"next": self.next, "acked": _runs(self._acked)}))
+        os.replace(tmp, self._cursor_path)
+        # The last segment stays open for appends even once delivered.
+        while len(self._segments) > 1 and self._segments[1] <= self.next:
+            self._segment_path(self._segments.pop(0)).unlink()
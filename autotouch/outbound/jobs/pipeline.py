@@ -0,0 +1,193 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from shared.integrations.rapidapi.metrics import MetricsRegistry, get_default_registry
+
+from outbound.jobs.job_fetch import FetchTask, iter_task_jobs
+from outbound.jobs.job_schema import JobRecord
+from outbound.jobs.keyword_plan import KeywordMatcher
+from outbound.jobs.webhook import ByteBudget, encode_record
+
+DEFAULT_QUEUE_SIZE = 500
+
+_DONE = object()
+_POLL = 0.1
+
+
+class PipelineStopped(Exception):
+    pass
+
+
+def _put(target: "queue.Queue[Any]", item: Any, stop: threading.Event) -> None:
+    # Blocks while the queue is full (backpressure) but gives up once the
+    # pipeline is stopping, so a failed stage never strands another.
+    while True:
+        if stop.is_set():
+            raise PipelineStopped()
+        try:
+            target.put(item, timeout=_POLL)
+            return
+        except queue.Full:
+            continue
+
+
+def _get(source: "queue.Queue[Any]", stop: threading.Event) -> Any:
+    while True:
+        try:
+            return source.get(timeout=_POLL)
+        except queue.Empty:
+            if stop.is_set():
+                raise PipelineStopped()
+
+
+def stream_jobs(
+    tasks: List[FetchTask],
+    window: str,
+    build: Callable[[JobRecord, Set[str], Set[str]], Dict[str, Any]],
+    post: Callable[[List[Dict[str, Any]]], None],
+    batch_size: int = 100,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    workers: int = 1,
+    derive_24h: bool = False,
+    max_items: Optional[int] = None,
+    keep_raw: bool = False,
+    skip: Optional[Callable[[str], bool]] = None,
+    metrics: Optional[MetricsRegistry] = None,
+    budget: Optional[ByteBudget] = None,
+) -> Dict[str, Any]:
+    """Fetch -> dedupe -> build -> batched post, connected by bounded queues.
+
+    ``workers`` threads run fetch tasks and feed one dedupe thread, which
+    feeds the caller's thread, where jobs are built and full batches go to
+    ``post``. Each queue holds at most ``queue_size`` items, so a slow
+    webhook throttles the fetchers and memory is bounded by the queues plus
+    the set of seen keys.
+
+    Until a job is built, later sightings (another source or keyword) add
+    their source and keywords to it; once built, its record may already be
+    delivered, so they are dropped. ``skip(key)`` drops keys before building
+    (e.g. already emitted). With a ``budget`` a batch is also posted before its
+    encoded size would pass ``budget.bytes``. Returns counts and time to
+    first delivery.
+    """
+    metrics = metrics or get_default_registry()
+    start = time.perf_counter()
+    stop = threading.Event()
+    pending: "queue.Queue[Any]" = queue.Queue()
+    for task in tasks:
+        pending.put(task)
+    jobs: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+    unique: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+    fetchers = max(1, min(workers, len(tasks)))
+    errors: List[BaseException] = []
+    # Sources and keywords of jobs queued but not yet built.
+    unbuilt: Dict[str, Tuple[Set[str], Set[str]]] = {}
+    attribution = threading.Lock()
+    matchers = {batch: KeywordMatcher(batch) for batch in {tuple(task[4]) for task in tasks}}
+    stats: Dict[str, Any] = {
+        "fetched": 0,
+        "unique": 0,
+        "skipped": 0,
+        "built": 0,
+        "sent": 0,
+        "batches": 0,
+        "first_post_seconds": None,
+    }
+
+    def fetch() -> None:
+        try:
+            while not stop.is_set():
+                try:
+                    task = pending.get_nowait()
+                except queue.Empty:
+                    break
+                matcher = matchers[tuple(task[4])]
+                for job, matched in iter_task_jobs(
+                    task, window, derive_24h, max_items, keep_raw, matcher, metrics
+                ):
+                    _put(jobs, (job, task[0], matched), stop)
+            _put(jobs, _DONE, stop)
+        except PipelineStopped:
+            pass
+        except BaseException as exc:
+            errors.append(exc)
+            stop.set()
+
+    def dedupe() -> None:
+        seen: Set[str] = set()
+        remaining = fetchers
+        try:
+            while remaining:
+                item = _get(jobs, stop)
+                if item is _DONE:
+                    remaining -= 1
+                    continue
+                job, source, matched = item
+                stats["fetched"] += 1
+                if job.key in seen:
+                    with attribution:
+                        held = unbuilt.get(job.key)
+                        if held is not None:
+                            held[0].add(source)
+                            held[1].update(matched)
+                    continue
+                seen.add(job.key)
+                stats["unique"] += 1
+                if skip is not None and skip(job.key):
+                    stats["skipped"] += 1
+                    continue
+                with attribution:
+                    unbuilt[job.key] = ({source}, set(matched))
+                _put(unique, job, stop)
+            _put(unique, _DONE, stop)
+        except PipelineStopped:
+            pass
+        except BaseException as exc:
+            errors.append(exc)
+            stop.set()
+
+    threads = [threading.Thread(target=fetch, daemon=True) for _ in range(fetchers)]
+    threads.append(threading.Thread(target=dedupe, daemon=True))
+    for thread in threads:
+        thread.start()
+
+    def flush(batch: List[Dict[str, Any]]) -> None:
+        post(batch)
+        stats["sent"] += len(batch)
+        stats["batches"] += 1
+        if stats["first_post_seconds"] is None:
+            stats["first_post_seconds"] = time.perf_counter() - start
+
+    batch: List[Dict[str, Any]] = []
+    size = 0
+    try:
+        while True:
+            try:
+                item = _get(unique, stop)
+            except PipelineStopped:
+                raise errors[0] if errors else RuntimeError("pipeline stopped")
+            if item is _DONE:
+                break
+            with attribution:
+                sources, keywords = unbuilt.pop(item.key)
+            item = build(item, sources, keywords)
+            stats["built"] += 1
+            if budget is not None:
+                item_size = len(encode_record(item)) + 1
+                if batch and size + item_size > budget.bytes:
+                    flush(batch)
+                    batch, size = [], 0
+                size += item_size
+            batch.append(item)
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch, size = [], 0
+        if batch:
+            flush(batch)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return stats
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Load .env from repo root
+env_path = ROOT / ".env"
+if env_path.exists():
+    for line in env_path.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        os.environ.setdefault(key.strip(), value.strip())
+
+sys.path.insert(0, str(ROOT))
+
+from shared.integrations.rapidapi.jobs.client import RapidApiLinkedInJobsClient
+from shared.integrations.rapidapi.jobs.active_jobs_db import RapidApiActiveJobsDbClient
+from shared.integrations.rapidapi.metrics import get_default_registry
+from shared.integrations.rapidapi.transport import close_default_transport
+from outbound.shared.job_titles import AE_TITLES, SDR_TITLES, to_or_query
+from outbound.jobs.job_fetch import build_record, fetch_jobs, normalize_keywords
+from outbound.jobs.dedupe_index import DEFAULT_TTL_DAYS, DedupeIndex
+from outbound.jobs.incremental import IncrementalState
+from outbound.jobs.near_dupes import DEFAULT_THRESHOLD, merge_near_duplicates
+from outbound.jobs.webhook import (
+    DEFAULT_BATCH_BYTES,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_TARGET_SECONDS,
+    DEFAULT_WEBHOOK_URL,
+    ByteBudget,
+    WebhookSender,
+    batches_by_bytes,
+    chunked,
+)
+
+TITLE_SETS = {"SDR": SDR_TITLES, "AE": AE_TITLES}
+
+SEARCH_DEFAULTS: Dict[str, Any] = {
+    "titles": "SDR",
+    "window": "24h",
+    "keywords": [],
+    "employees_lte": None,
+    "employees_gte": None,
+    "limit": 50,
+    "max_items": None,
+    "batch_keywords": False,
+    "local_keywords": False,
+    "derive_24h": False,
+    "near_dupes": False,
+    "near_dupe_threshold": DEFAULT_THRESHOLD,
+    "incremental": False,
+    "batch_size": 100,
+    "destination": "default",
+}
+
+DEFAULT_DESTINATION = {
+    "url_env": "AUTOTOUCH_TABLE_WEBHOOK_URL",
+    "url": DEFAULT_WEBHOOK_URL,
+    "token_env": "AUTOTOUCH_TABLE_WEBHOOK_TOKEN",
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Run every search in a JSON config in one process and send results to their webhooks."
+    )
+    parser.add_argument("config", help="JSON file with a \"searches\" list (see searches.example.json).")
+    parser.add_argument(
+        "--only",
+        nargs="*",
+        default=None,
+        help="Run just the searches with these names.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Concurrent requests per search (overrides the config's \"workers\").",
+    )
+    parser.add_argument(
+        "--metrics-out",
+        default=None,
+        help="Write request metrics at exit (.prom/.txt = Prometheus text, otherwise JSON).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Do not send to webhooks; just print summaries.",
+    )
+    args = parser.parse_args()
+    try:
+        return run(args)
+    finally:
+        if args.metrics_out:
+            get_default_registry().dump(args.metrics_out)
+            print(f"Wrote metrics to {args.metrics_out}.")
+
+
+def load_config(path: str) -> Dict[str, Any]:
+    config = json.loads(Path(path).read_text())
+    searches = config.get("searches")
+    if not isinstance(searches, list) or not searches:
+        raise ValueError(f"{path}: expected a non-empty \"searches\" list")
+    defaults = {**SEARCH_DEFAULTS, **config.get("defaults", {})}
+    destinations = {"default": DEFAULT_DESTINATION, **config.get("destinations", {})}
+    resolved = []
+    names: Set[str] = set()
+    for position, raw in enumerate(searches, 1):
+        search = {**defaults, **raw}
+        search.setdefault("name", f"search-{position}")
+        if search["name"] in names:
+            raise ValueError(f"{path}: duplicate search name {search['name']!r}")
+        names.add(search["name"])
+        if search["window"] not in ("24h", "7d"):
+            raise ValueError(f"{search['name']}: window must be 24h or 7d")
+        if search["destination"] not in destinations:
+            raise ValueError(f"{search['name']}: unknown destination {search['destination']!r}")
+        titles = search["titles"]
+        if isinstance(titles, str):
+            if titles.upper() not in TITLE_SETS:
+                raise ValueError(
+                    f"{search['name']}: titles must be one of {sorted(TITLE_SETS)} or a list"
+                )
+            titles = TITLE_SETS[titles.upper()]
+        search["title_filter"] = to_or_query(titles)
+        search["keywords"] = normalize_keywords(search["keywords"])
+        resolved.append(search)
+    config["searches"] = resolved
+    config["destinations"] = destinations
+    return config
+
+
+def run(args: argparse.Namespace) -> int:
+    config = load_config(args.config)
+    searches = config["searches"]
+    if args.only:
+        searches = [search for search in searches if search["name"] in args.only]
+        missing = set(args.only) - {search["name"] for search in searches}
+        if missing:
+            print(f"Unknown searches: {', '.join(sorted(missing))}", file=sys.stderr)
+            return 2
+
+    # Every search goes through the same transport, so identical requests
+    # (and 7d responses a later 24h search derives from) hit the response
+    # cache. Without a configured cache directory a throwaway one is used.
+    scratch = None
+    if config.get("cache_dir"):
+        os.environ.setdefault("RAPIDAPI_CACHE_DIR", str(ROOT / config["cache_dir"]))
+    elif not os.getenv("RAPIDAPI_CACHE_DIR"):
+        scratch = tempfile.TemporaryDirectory(prefix="outbound-searches-")
+        os.environ["RAPIDAPI_CACHE_DIR"] = scratch.name
+    linkedin_client = RapidApiLinkedInJobsClient()
+    active_client = RapidApiActiveJobsDbClient()
+
+    # One index view per destination, scoped by its URL like send_sdr_webhook's,
+    # so both tools skip jobs the other already sent to the same table.
+    indexes: Dict[str, DedupeIndex] = {}
+    state_dir = ROOT / config.get("state_dir", ".cache/outbound-state")
+    workers = args.workers or config.get("workers", 1)
+    # Keys already delivered to each destination during this run.
+    sent: Dict[str, Set[str]] = {}
+    # One sender (and connection pool) per destination, shared by its searches.
+    senders: Dict[str, WebhookSender] = {}
+    failed = 0
+    try:
+        for search in searches:
+            name = search["destination"]
+            try:
+                destination = config["destinations"][name]
+                if not args.dry_run and name not in senders:
+                    senders[name] = webhook_sender(name, destination, config)
+                if config.get("dedupe_index") and name not in indexes:
+                    indexes[name] = DedupeIndex(
+                        ROOT / config["dedupe_index"],
+                        ttl_days=config.get("dedupe_ttl_days", DEFAULT_TTL_DAYS),
+                        scope=destination_url(destination) or "",
+                    )
+                run_search(
+                    search,
+                    senders.get(name),
+                    linkedin_client,
+                    active_client,
+                    workers,
+                    sent.setdefault(name, set()),
+                    indexes.get(name),
+                    state_dir,
+                )
+            except Exception as exc:
+                failed += 1
+                print(f"[{search['name']}] failed: {exc}", file=sys.stderr)
+    finally:
+        for sender in senders.values():
+            sender.close()
+        for index in indexes.values():
+            index.close()
+        cache = linkedin_client.transport.cache
+        close_default_transport()
+        if scratch:
+            if cache:
+                cache.close()
+            scratch.cleanup()
+    return 1 if failed else 0
+
+
+def destination_url(destination: Dict[str, Any]) -> Optional[str]:
+    return os.getenv(destination.get("url_env", ""), destination.get("url"))
+
+
+def webhook_sender(name: str, destination: Dict[str, Any], config: Dict[str, Any]) -> WebhookSender:
+    url = destination_url(destination)
+    token = os.getenv(destination.get("token_env", ""), destination.get("token"))
+    if not url or not token:
+        raise RuntimeError(f"missing webhook url/token for destination {name!r}")
+    batch_bytes = config.get("batch_bytes", DEFAULT_BATCH_BYTES)
+    budget = None
+    if batch_bytes:
+        budget = ByteBudget(
+            batch_bytes,
+            target_seconds=config.get("ingest_target_seconds", DEFAULT_TARGET_SECONDS),
+        )
+    return WebhookSender(
+        url,
+        token,
+        concurrency=config.get("webhook_concurrency", DEFAULT_CONCURRENCY),
+        budget=budget,
+        gzip=config.get("webhook_gzip", False),
+    )
+
+
+def run_search(
+    search: Dict[str, Any],
+    sender: Optional[WebhookSender],
+    linkedin_client: RapidApiLinkedInJobsClient,
+    active_client: RapidApiActiveJobsDbClient,
+    workers: int,
+    sent: Set[str],
+    index: Optional[DedupeIndex],
+    state_dir: Path,
+) -> None:
+    """Fetch, filter and deliver one search; ``sender`` is None for a dry run."""
+    name = search["name"]
+    started = time.perf_counter()
+    state = None
+    if search["incremental"]:
+        state = IncrementalState(
+            state_dir,
+            {
+                "title_filter": search["title_filter"],
+                "keywords": sorted(keyword.lower() for keyword in search["keywords"]),
+                "employees_lte": search["employees_lte"],
+                "employees_gte": search["employees_gte"],
+                "window": search["window"],
+            },
+        )
+
+    jobs_by_key, sources_by_key, keywords_by_key = fetch_jobs(
+        linkedin_client,
+        active_client,
+        search["window"],
+        search["title_filter"],
+        search["keywords"],
+        search["employees_lte"],
+        search["employees_gte"],
+        search["limit"],
+        derive_24h=search["derive_24h"],
+        max_items=search["max_items"],
+        workers=workers,
+        batch_keywords=search["batch_keywords"],
+        local_keywords=search["local_keywords"],
+        date_filter=state.date_filter() if state else None,
+    )
+    fetched = len(jobs_by_key)
+    if search["near_dupes"]:
+        merge_near_duplicates(
+            jobs_by_key, sources_by_key, keywords_by_key, search["near_dupe_threshold"]
+        )
+
+    keys = [
+        key
+        for key in jobs_by_key
+        if key not in sent and (not state or state.is_new(key))
+    ]
+    if index:
+        keys = index.filter_new(keys)
+    records = [
+        build_record(
+            key,
+            jobs_by_key[key],
+            sources_by_key.get(key, set()),
+            keywords_by_key.get(key, set()),
+            search["window"],
+            search["employees_lte"],
+            search["employees_gte"],
+        )
+        for key in keys
+    ]
+
+    report: Dict[str, Any] = {"sent": 0, "failed": []}
+    if records and sender is not None:
+
+        def delivered(batch: List[Dict[str, Any]]) -> None:
+            batch_keys = [record["unknown_id"] for record in batch]
+            sent.update(batch_keys)
+            if state:
+                state.mark_emitted(batch)
+            if index:
+                index.add_many(batch_keys)
+
+        try:
+            batches = (
+                batches_by_bytes(records, sender.budget, search["batch_size"])
+                if sender.budget
+                else chunked(records, search["batch_size"])
+            )
+            report = sender.send(batches, on_delivered=delivered)
+        finally:
+            if state:
+                state.save()
+    elif sender is None:
+        # Later searches in a dry run still see these as taken.
+        sent.update(keys)
+
+    print(
+        f"[{name}] {search['window']} -> {search['destination']}: "
+        f"fetched {fetched} unique jobs, {len(records)} new, "
+        f"sent {report['sent']} ({time.perf_counter() - started:.1f}s)."
+    )
+    if report["failed"]:
+        failed = sum(failure["records"] for failure in report["failed"])
+        raise RuntimeError(
+            f"{len(report['failed'])} batches ({failed} records) failed after retries: "
+            f"{report['failed'][0]['error']}"
+        )
@@ -3,10 +3,8 @@ import argparse
 import json
 import os
 import sys
-import urllib.error
-import urllib.request
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 ROOT = Path(__file__).resolve().parents[2]
 
@@ -24,48 +22,31 @@ sys.path.insert(0, str(ROOT))
 
 from shared.integrations.rapidapi.jobs.client import RapidApiLinkedInJobsClient
 from shared.integrations.rapidapi.jobs.active_jobs_db import RapidApiActiveJobsDbClient
+from shared.integrations.rapidapi.metrics import get_default_registry
 from outbound.shared.job_titles import SDR_TITLES, to_or_query
 from outbound.jobs.job_fetch import (
     build_record,
     fetch_jobs,
     normalize_keywords,
+    plan_fetch_tasks,
 )
-
-DEFAULT_WEBHOOK_URL = (
-    "https://app.autotouch.ai/api/webhooks/tables/697a500b57002fdbff95a9cb/ingest"
+from outbound.jobs.content_index import ContentIndex, delta
+from outbound.jobs.dedupe_index import DEFAULT_TTL_DAYS, DedupeIndex
+from outbound.jobs.incremental import IncrementalState
+from outbound.jobs.outbox import Outbox
+from outbound.jobs.near_dupes import DEFAULT_THRESHOLD, merge_near_duplicates
+from outbound.jobs.pipeline import DEFAULT_QUEUE_SIZE, stream_jobs
+from outbound.jobs.webhook import (
+    DEFAULT_BATCH_BYTES,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_TARGET_SECONDS,
+    DEFAULT_WEBHOOK_URL,
+    ByteBudget,
+    WebhookSender,
+    batches_by_bytes,
+    chunked,
 )
 
-def post_records(
-    url: str,
-    token: str,
-    records: List[Dict[str, Any]],
-) -> None:
-    payload = json.dumps({"records": records}).encode("utf-8")
-    request = urllib.request.Request(
-        url,
-        data=payload,
-        headers={
-            "Content-Type": "application/json",
-            "X-Autotouch-Token": token,
-        },
-        method="POST",
-    )
-    try:
-        with urllib.request.urlopen(request, timeout=30) as response:
-            if response.status != 200:
-                body = response.read().decode("utf-8", errors="replace")
-                raise RuntimeError(
-                    f"Webhook returned {response.status}: {body}"
-                )
-    except urllib.error.HTTPError as exc:
-        body = exc.read().decode("utf-8", errors="replace")
-        raise RuntimeError(f"Webhook error {exc.code}: {body}") from exc
-
-
-def chunked(items: List[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any]]]:
-    for i in range(0, len(items), size):
-        yield items[i : i + size]
-
 
 def main() -> int:
     parser = argparse.ArgumentParser(
@@ -101,11 +82,150 @@ def main() -> int:
         default=50,
         help="Limit per source per keyword.",
     )
+    parser.add_argument(
+        "--max-items",
+        type=int,
+        default=None,
+        help="Page through results up to this many jobs per source per keyword (default: one page of --limit).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Concurrent keyword x source requests (1 = serial).",
+    )
+    parser.add_argument(
+        "--batch-keywords",
+        action="store_true",
+        help="OR keywords into a few description_filter queries and attribute matches locally.",
+    )
+    parser.add_argument(
+        "--local-keywords",
+        action="store_true",
+        help="Query each source once without description_filter and keep jobs whose title/description mention a keyword.",
+    )
+    parser.add_argument(
+        "--derive-24h",
+        action="store_true",
+        help="For --window 24h, filter a fresh cached 7d response locally instead of re-querying (needs RAPIDAPI_CACHE_DIR).",
+    )
     parser.add_argument(
         "--batch-size",
         type=int,
         default=100,
-        help="Records per webhook POST.",
+        help="Max records per webhook POST.",
+    )
+    parser.add_argument(
+        "--batch-bytes",
+        type=int,
+        default=DEFAULT_BATCH_BYTES,
+        help="Starting JSON bytes per webhook POST, adapted from ingest latency and errors (0 = batch by --batch-size only).",
+    )
+    parser.add_argument(
+        "--ingest-target-seconds",
+        type=float,
+        default=DEFAULT_TARGET_SECONDS,
+        help="POST latency above which --batch-bytes shrinks.",
+    )
+    parser.add_argument(
+        "--webhook-concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Webhook POSTs in flight at once (each batch is retried on transient errors).",
+    )
+    parser.add_argument(
+        "--webhook-gzip",
+        action="store_true",
+        help="Gzip webhook bodies (falls back to plain JSON if the webhook answers 415).",
+    )
+    parser.add_argument(
+        "--failed-report",
+        default=None,
+        help="Write batches that still failed after retries (with their unknown_ids) to this JSON file.",
+    )
+    parser.add_argument(
+        "--near-dupes",
+        action="store_true",
+        help="Merge near-duplicate postings (same job syndicated with small differences).",
+    )
+    parser.add_argument(
+        "--near-dupe-threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Estimated Jaccard similarity at which two jobs are merged.",
+    )
+    parser.add_argument(
+        "--near-dupe-report",
+        default=None,
+        help="Write the merged near-duplicate clusters to this JSON file.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch and send jobs newer than the last run with the same filters.",
+    )
+    parser.add_argument(
+        "--state-dir",
+        default=str(ROOT / ".cache" / "outbound-state"),
+        help="Where --incremental keeps per-filter-set high-water marks.",
+    )
+    parser.add_argument(
+        "--dedupe-index",
+        nargs="?",
+        const=str(ROOT / ".cache" / "outbound-sent.sqlite3"),
+        default=None,
+        help="Skip jobs already sent by any earlier run (optional path to the SQLite index).",
+    )
+    parser.add_argument(
+        "--dedupe-ttl-days",
+        type=float,
+        default=DEFAULT_TTL_DAYS,
+        help="Days a sent job stays in --dedupe-index.",
+    )
+    parser.add_argument(
+        "--outbox",
+        nargs="?",
+        const=str(ROOT / ".cache" / "outbound-outbox"),
+        default=None,
+        help="Spool records to this directory before posting; undelivered ones are resent by the next run.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Only post the undelivered records in --outbox (default directory if omitted); no API calls.",
+    )
+    parser.add_argument(
+        "--changed-only",
+        nargs="?",
+        const=str(ROOT / ".cache" / "outbound-content.sqlite3"),
+        default=None,
+        help="Skip records whose content hash matches the last delivered version (optional path to the SQLite index).",
+    )
+    parser.add_argument(
+        "--send-deltas",
+        action="store_true",
+        help="With --changed-only, send changed records as unknown_id + content_hash + the fields that changed.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Post batches while fetching continues (sightings after a job is built are dropped).",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help="Bound on jobs/records buffered between --stream stages.",
+    )
+    parser.add_argument(
+        "--metrics-out",
+        default=None,
+        help="Write request metrics at exit (.prom/.txt = Prometheus text, otherwise JSON).",
+    )
+    parser.add_argument(
+        "--keep-raw",
+        action="store_true",
+        help="Debug: keep each job's full API payload in memory (JobRecord.raw).",
     )
     parser.add_argument(
         "--dry-run",
@@ -113,10 +233,58 @@ def main() -> int:
         help="Do not send to webhook; just print summary.",
     )
     args = parser.parse_args()
+    try:
+        return run(args)
+    finally:
+        if args.metrics_out:
+            get_default_registry().dump(args.metrics_out)
+            print(f"Wrote metrics to {args.metrics_out}.")
 
+
+def run(args: argparse.Namespace) -> int:
+    if args.resume:
+        return resume(args)
     keywords = normalize_keywords(args.keywords)
     title_filter = to_or_query(SDR_TITLES)
 
+    state = None
+    if args.incremental:
+        state = IncrementalState(
+            args.state_dir,
+            {
+                "title_filter": title_filter,
+                "keywords": sorted(keyword.lower() for keyword in keywords),
+                "employees_lte": args.employees_lte,
+                "employees_gte": args.employees_gte,
+                "window": args.window,
+            },
+        )
+
+    index = None
+    if args.dedupe_index:
+        index = DedupeIndex(args.dedupe_index, ttl_days=args.dedupe_ttl_days, scope=table_webhook_url())
+    content = None
+    if args.changed_only:
+        content = ContentIndex(args.changed_only, ttl_days=args.dedupe_ttl_days)
+    try:
+        if args.stream:
+            return run_stream(args, title_filter, keywords, state, index, content)
+        return run_batch(args, title_filter, keywords, state, index, content)
+    finally:
+        if index:
+            index.close()
+        if content:
+            content.close()
+
+
+def run_batch(
+    args: argparse.Namespace,
+    title_filter: str,
+    keywords: List[str],
+    state: Optional[IncrementalState],
+    index: Optional[DedupeIndex],
+    content: Optional[ContentIndex] = None,
+) -> int:
     linkedin_client = RapidApiLinkedInJobsClient()
     active_client = RapidApiActiveJobsDbClient()
 
@@ -129,10 +297,32 @@ def main() -> int:
         args.employees_lte,
         args.employees_gte,
         args.limit,
+        derive_24h=args.derive_24h,
+        max_items=args.max_items,
+        workers=args.workers,
+        batch_keywords=args.batch_keywords,
+        date_filter=state.date_filter() if state else None,
+        keep_raw=args.keep_raw,
+        local_keywords=args.local_keywords,
     )
+    fetched = len(jobs_by_key)
+
+    if args.near_dupes:
+        clusters = merge_near_duplicates(
+            jobs_by_key, sources_by_key, keywords_by_key, args.near_dupe_threshold
+        )
+        merged = sum(len(cluster["merged"]) for cluster in clusters)
+        print(f"Merged {merged} near-duplicate jobs into {len(clusters)} clusters.")
+        if args.near_dupe_report:
+            Path(args.near_dupe_report).write_text(json.dumps(clusters, indent=2, default=str))
+            print(f"Wrote near-duplicate clusters to {args.near_dupe_report}.")
 
+    keys = [key for key in jobs_by_key if not state or state.is_new(key)]
+    if index:
+        keys = index.filter_new(keys)
     records: List[Dict[str, Any]] = []
-    for key, job in jobs_by_key.items():
+    for key in keys:
+        job = jobs_by_key[key]
         record = build_record(
             key,
             job,
@@ -144,24 +334,311 @@ def main() -> int:
         )
         records.append(record)
 
-    print(f"Fetched {len(records)} unique jobs.")
-    if args.dry_run or not records:
+    if state or index:
+        print(f"Fetched {fetched} unique jobs, {len(records)} not sent before.")
+    else:
+        print(f"Fetched {len(records)} unique jobs.")
+    on_delivered = None
+    if content:
+        records, full = select_changed(records, content, args.send_deltas)
+        print(f"{len(records)} new or changed since last delivered.")
+        on_delivered = record_content(content, full)
+
+    outbox = Outbox(args.outbox) if args.outbox and not args.dry_run else None
+    if args.dry_run or not (records or (outbox is not None and len(outbox))):
+        return 0
+    try:
+        return deliver(args, records, outbox, state, index, on_delivered)
+    finally:
+        # Persist whatever was delivered, even if some batches failed.
+        if state:
+            state.save()
+
+
+def resume(args: argparse.Namespace) -> int:
+    outbox = Outbox(args.outbox or ROOT / ".cache" / "outbound-outbox")
+    if not len(outbox):
+        print(f"Nothing to resume in {outbox.directory}.")
+        return 0
+    if args.dry_run:
+        print(f"{len(outbox)} undelivered records in {outbox.directory}.")
+        return 0
+    index = None
+    if args.dedupe_index:
+        index = DedupeIndex(args.dedupe_index, ttl_days=args.dedupe_ttl_days, scope=table_webhook_url())
+    content = None
+    if args.changed_only:
+        content = ContentIndex(args.changed_only, ttl_days=args.dedupe_ttl_days)
+    try:
+        return deliver(
+            args, [], outbox, None, index, record_content(content, {}) if content else None
+        )
+    finally:
+        if index:
+            index.close()
+        if content:
+            content.close()
+
+
+def deliver(
+    args: argparse.Namespace,
+    records: List[Dict[str, Any]],
+    outbox: Optional[Outbox],
+    state: Optional[IncrementalState],
+    index: Optional[DedupeIndex],
+    on_delivered: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+) -> int:
+    """Post ``records``; with an ``outbox``, spool them first, behind its undelivered tail.
+
+    Only this run's records update ``state`` (the tail may come from other
+    filters); every delivered record goes into ``index``, then goes to
+    ``on_delivered``.
+    """
+    webhook_url, token = webhook_settings()
+    if not token:
+        return 1
+
+    fresh = records
+    numbers: Dict[int, int] = {}
+    if outbox is not None:
+        tail = outbox.pending()
+        if tail:
+            print(f"Resending {len(tail)} undelivered records from {outbox.directory}.")
+        queued = {record["unknown_id"] for _, record in tail}
+        fresh = [record for record in records if record["unknown_id"] not in queued]
+        numbered = tail + list(zip(outbox.append(fresh), fresh))
+        numbers = {id(record): number for number, record in numbered}
+        records = [record for _, record in numbered]
+    fresh_ids = {id(record) for record in fresh}
+
+    def delivered(batch: List[Dict[str, Any]]) -> None:
+        if outbox is not None:
+            outbox.ack(numbers[id(record)] for record in batch)
+        if state:
+            state.mark_emitted(record for record in batch if id(record) in fresh_ids)
+        if index:
+            index.add_many(record["unknown_id"] for record in batch)
+        if on_delivered is not None:
+            on_delivered(batch)
+
+    budget = byte_budget(args)
+    batches = (
+        batches_by_bytes(records, budget, args.batch_size)
+        if budget
+        else chunked(records, args.batch_size)
+    )
+    with WebhookSender(
+        webhook_url,
+        token,
+        concurrency=args.webhook_concurrency,
+        budget=budget,
+        gzip=args.webhook_gzip,
+    ) as sender:
+        report = sender.send(batches, on_delivered=delivered)
+
+    print(f"Sent {report['sent']} records to webhook in {report['batches']} batches.")
+    if report["failed"] and outbox is not None:
+        print(f"{len(outbox)} records stay in {outbox.directory}; rerun with --resume to send them.")
+    return report_failures(report["failed"], args.failed_report)
+
+
+def select_changed(
+    records: List[Dict[str, Any]], content: ContentIndex, deltas: bool
+) -> Tuple[List[Dict[str, Any]], Dict[int, Dict[str, Any]]]:
+    """New or changed records (as deltas when asked), plus the full records
+    by id() of the selected record.
+    """
+    selected: List[Dict[str, Any]] = []
+    full: Dict[int, Dict[str, Any]] = {}
+    for record, fields in content.diff(records):
+        sent = delta(record, fields) if deltas and fields is not None else record
+        selected.append(sent)
+        full[id(sent)] = record
+    return selected, full
+
+
+def record_content(
+    content: ContentIndex, full: Dict[int, Dict[str, Any]]
+) -> Callable[[List[Dict[str, Any]]], None]:
+    """``on_delivered`` that stores delivered records in ``content``.
+
+    Records selected this run are stored in full (``full`` maps the id() of
+    what was sent, possibly a delta, to the full record); spooled records
+    from earlier runs may be deltas themselves and are merged.
+    """
+
+    def on_delivered(batch: List[Dict[str, Any]]) -> None:
+        spooled = [record for record in batch if id(record) not in full]
+        content.add_many(full.pop(id(record)) for record in batch if id(record) in full)
+        content.add_many(spooled, merge=True)
+
+    return on_delivered
+
+
+def byte_budget(args: argparse.Namespace) -> Optional[ByteBudget]:
+    if not args.batch_bytes:
+        return None
+    return ByteBudget(args.batch_bytes, target_seconds=args.ingest_target_seconds)
+
+
+def report_failures(failed: List[Dict[str, Any]], path: Optional[str]) -> int:
+    if not failed:
         return 0
+    for failure in failed:
+        print(
+            f"Batch {failure['batch']} ({failure['records']} records) failed: {failure['error']}",
+            file=sys.stderr,
+        )
+    if path:
+        Path(path).write_text(json.dumps(failed, indent=2))
+        print(f"Wrote failed batches to {path}.", file=sys.stderr)
+    return 1
 
-    webhook_url = os.getenv("AUTOTOUCH_TABLE_WEBHOOK_URL", DEFAULT_WEBHOOK_URL)
+
+def table_webhook_url() -> str:
+    return os.getenv("AUTOTOUCH_TABLE_WEBHOOK_URL", DEFAULT_WEBHOOK_URL)
+
+
+def webhook_settings() -> Tuple[str, Optional[str]]:
     token = os.getenv("AUTOTOUCH_TABLE_WEBHOOK_TOKEN")
     if not token:
         print(
             "Missing AUTOTOUCH_TABLE_WEBHOOK_TOKEN in environment.",
             file=sys.stderr,
         )
-        return 1
+    return table_webhook_url(), token
+
 
-    for batch in chunked(records, args.batch_size):
-        post_records(webhook_url, token, batch)
+def run_stream(
+    args: argparse.Namespace,
+    title_filter: str,
+    keywords: List[str],
+    state: Optional[IncrementalState],
+    index: Optional[DedupeIndex],
+    content: Optional[ContentIndex] = None,
+) -> int:
+    if args.near_dupes:
+        print("--near-dupes needs the full result set; drop it or --stream.", file=sys.stderr)
+        return 2
+    webhook_url, token = None, None
+    outbox = None
+    if not args.dry_run:
+        webhook_url, token = webhook_settings()
+        if not token:
+            return 1
+        if args.outbox:
+            outbox = Outbox(args.outbox)
+            # Clear the previous run's tail first; if that fails the webhook is down.
+            tail_delivered = record_content(content, {}) if content else None
+            if len(outbox) and deliver(args, [], outbox, None, index, tail_delivered):
+                return 1
 
-    print(f"Sent {len(records)} records to webhook.")
-    return 0
+    tasks = plan_fetch_tasks(
+        RapidApiLinkedInJobsClient(),
+        RapidApiActiveJobsDbClient(),
+        title_filter,
+        keywords,
+        args.employees_lte,
+        args.employees_gte,
+        args.limit,
+        batch_keywords=args.batch_keywords,
+        date_filter=state.date_filter() if state else None,
+        local_keywords=args.local_keywords,
+    )
+
+    def build(job: Any, sources: Set[str], matched: Set[str]) -> Dict[str, Any]:
+        return build_record(
+            job.key, job, sources, matched, args.window, args.employees_lte, args.employees_gte
+        )
+
+    budget = byte_budget(args)
+    sender = dispatch = None
+    if not args.dry_run:
+        sender = WebhookSender(
+            webhook_url,
+            token,
+            concurrency=args.webhook_concurrency,
+            budget=budget,
+            gzip=args.webhook_gzip,
+        )
+
+    unchanged = 0
+    # Outbox numbers and full (non-delta) records of batches in flight.
+    numbers: Dict[str, int] = {}
+    full: Dict[int, Dict[str, Any]] = {}
+    record_changes = record_content(content, full) if content else None
+
+    def delivered(batch: List[Dict[str, Any]]) -> None:
+        keys = [record["unknown_id"] for record in batch]
+        if outbox is not None:
+            outbox.ack(numbers.pop(key) for key in keys)
+        if state:
+            state.mark_emitted(batch)
+        if index:
+            index.add_many(keys)
+        if record_changes is not None:
+            record_changes(batch)
+
+    def post(batch: List[Dict[str, Any]]) -> None:
+        nonlocal unchanged
+        if content:
+            selected, changed = select_changed(batch, content, args.send_deltas)
+            unchanged += len(batch) - len(selected)
+            batch = selected
+        if dispatch is None or not batch:
+            return
+        if content:
+            full.update(changed)
+        if outbox is not None:
+            numbers.update(zip((record["unknown_id"] for record in batch), outbox.append(batch)))
+        dispatch.submit(batch)
+
+    def skip(key: str) -> bool:
+        return bool((state and not state.is_new(key)) or (index and key in index))
+
+    report: Dict[str, Any] = {"sent": 0, "batches": 0, "failed": []}
+    try:
+        if sender is not None:
+            dispatch = sender.dispatch(delivered)
+        stats = stream_jobs(
+            tasks,
+            args.window,
+            build,
+            post,
+            batch_size=args.batch_size,
+            queue_size=args.queue_size,
+            workers=args.workers,
+            derive_24h=args.derive_24h,
+            max_items=args.max_items,
+            keep_raw=args.keep_raw,
+            skip=skip if state or index else None,
+            budget=budget,
+        )
+    finally:
+        # Batches still in flight land (and are recorded) even if fetching failed.
+        if dispatch is not None:
+            report = dispatch.finish()
+        if sender:
+            sender.close()
+        if state and not args.dry_run:
+            state.save()
+
+    first = stats["first_post_seconds"]
+    print(
+        f"Fetched {stats['fetched']} jobs, {stats['unique']} unique"
+        + (f", {stats['skipped']} already sent" if state or index else "")
+        + (f", {unchanged} unchanged" if content else "")
+        + "."
+    )
+    if args.dry_run:
+        return 0
+    print(
+        f"Sent {report['sent']} records to webhook in {report['batches']} batches"
+        + (f" (first queued after {first:.1f}s)." if first is not None and report["batches"] else ".")
+    )
+    if report["failed"] and outbox is not None:
+        print(f"{len(outbox)} records stay in {outbox.directory}; rerun with --resume to send them.")
+    return report_failures(report["failed"], args.failed_report)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,70 @@
+from outbound.jobs.content_index import ContentIndex, content_hash, delta
+
+
+def _record(**fields):
+    record = {"unknown_id": "job-1", "job_title": "SDR", "company": "Acme", "window": "24h"}
+    record.update(fields)
+    record["content_hash"] = content_hash(record)
+    return record
+
+
+def test_new_records_come_back_without_changed_fields(tmp_path):
+    with ContentIndex(tmp_path / "content.sqlite3") as index:
+        record = _record()
+        assert index.diff([record]) == [(record, None)]
+
+
+def test_unchanged_records_are_skipped(tmp_path):
+    with ContentIndex(tmp_path / "content.sqlite3") as index:
+        index.add_many([_record()])
+        assert index.diff([_record()]) == []
+
+
+def test_run_fields_do_not_count_as_changes(tmp_path):
+    with ContentIndex(tmp_path / "content.sqlite3") as index:
+        index.add_many([_record()])
+        rerun = _record(window="7d", keywords="Clay", sources="linkedin", employees_lte=200)
+        assert index.diff([rerun]) == []
+
+
+def test_changed_records_list_added_changed_and_removed_fields(tmp_path):
+    with ContentIndex(tmp_path / "content.sqlite3") as index:
+        index.add_many([_record(location="Berlin")])
+        changed = _record(job_title="Senior SDR", remote=True)
+        assert index.diff([changed]) == [(changed, ["job_title", "location", "remote"])]
+
+
+def test_delta_keeps_key_hash_and_changed_fields():
+    record = _record(location="Berlin")
+    assert delta(record, ["location"]) == {
+        "unknown_id": "job-1",
+        "location": "Berlin",
+        "content_hash": record["content_hash"],
+    }
+
+
+def test_merged_deltas_keep_the_other_field_hashes(tmp_path):
+    with ContentIndex(tmp_path / "content.sqlite3") as index:
+        index.add_many([_record(location="Berlin")])
+        moved = _record(location="Paris")
+        index.add_many([delta(moved, ["location"])], merge=True)
+        assert index.diff([moved]) == []
+        retitled = _record(location="Paris", job_title="BDR")
+        assert index.diff([retitled]) == [(retitled, ["job_title"])]
+
+
+def test_entries_expire_unless_refreshed(tmp_path):
+    now = [0.0]
+    path = tmp_path / "content.sqlite3"
+    with ContentIndex(path, ttl_days=1, clock=lambda: now[0]) as index:
+        index.add_many([_record()])
+        now[0] = 0.9 * 86400
+        assert index.diff([_record()]) == []
+    now[0] = 1.5 * 86400
+    with ContentIndex(path, ttl_days=1, clock=lambda: now[0]) as index:
+        # Refreshed by the unchanged diff at 0.9 days, so still known.
+        assert index.diff([_record()]) == []
+    now[0] = 3 * 86400
+    with ContentIndex(path, ttl_days=1, clock=lambda: now[0]) as index:
+        record = _record()
+        assert index.diff([record]) == [(record, None)]
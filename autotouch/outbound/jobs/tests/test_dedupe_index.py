@@ -0,0 +1,46 @@
+import pytest
+
+from outbound.jobs.dedupe_index import DedupeIndex
+
+
+@pytest.mark.parametrize("bloom", [False, True])
+def test_known_keys_are_filtered(tmp_path, bloom):
+    with DedupeIndex(tmp_path / "sent.sqlite3", bloom=bloom) as index:
+        index.add_many(["a", "b"])
+        assert index.filter_new(["a", "c", "b", "d"]) == ["c", "d"]
+        assert "a" in index
+        assert "c" not in index
+
+
+def test_keys_expire_after_ttl(tmp_path):
+    now = [0.0]
+    with DedupeIndex(tmp_path / "sent.sqlite3", ttl_days=1, clock=lambda: now[0]) as index:
+        index.add_many(["a"])
+        now[0] = 0.5 * 86400
+        index.add_many(["b"])
+        now[0] = 1.2 * 86400
+        # Expired rows are ignored before they are deleted.
+        assert index.filter_new(["a", "b"]) == ["a"]
+        assert index.expire() == 1
+        assert index.stats()["keys"] == 1
+
+
+def test_expired_keys_are_dropped_on_open(tmp_path):
+    now = [0.0]
+    path = tmp_path / "sent.sqlite3"
+    with DedupeIndex(path, ttl_days=1, clock=lambda: now[0]) as index:
+        index.add_many(["a"])
+    now[0] = 2 * 86400
+    with DedupeIndex(path, ttl_days=1, clock=lambda: now[0]) as index:
+        assert index.stats()["keys"] == 0
+        assert "a" not in index
+
+
+def test_scopes_share_a_file_but_not_keys(tmp_path):
+    path = tmp_path / "sent.sqlite3"
+    with DedupeIndex(path, scope="https://example.com/a") as first:
+        first.add_many(["job-1"])
+    with DedupeIndex(path, scope="https://example.com/b") as second:
+        assert "job-1" not in second
+    with DedupeIndex(path, scope="https://example.com/a") as again:
+        assert "job-1" in again
@@ -0,0 +1,60 @@
+import pytest
+
+from outbound.jobs.job_fetch import pick
+from outbound.jobs.job_schema import FIELDS, GENERIC_SCHEMA, JobSchema, schema_for_jobs
+
+LINKEDIN_JOB = {
+    "id": "LI-123",
+    "title": "Sales Development Representative",
+    "organization": "Acme Inc",
+    "organization_url": "https://www.linkedin.com/company/acme",
+    "url": "https://www.linkedin.com/jobs/view/123",
+    "date_posted": "2026-10-17T08:00:00",
+    "description_text": "Book meetings with Clay and Apollo.",
+    "employment_type": ["FULL_TIME"],
+    "remote_derived": False,
+}
+JSEARCH_JOB = {
+    "job_id": "js-9",
+    "job_title": "BDR",
+    "employer_name": "Globex",
+    "employer_website": "globex.com",
+    "job_apply_link": "https://globex.com/careers/9",
+    "job_city": "Austin",
+    "job_description": "",
+    "description": "Outbound prospecting.",
+    "job_posted_at_datetime_utc": "2026-10-17T09:00:00Z",
+}
+
+
+@pytest.mark.parametrize("job", [LINKEDIN_JOB, JSEARCH_JOB])
+def test_compiled_fields_match_pick(job):
+    schema = schema_for_jobs([LINKEDIN_JOB, JSEARCH_JOB])
+    for name, candidates in FIELDS.items():
+        assert schema.get(job, name) == pick(job, *candidates), name
+
+
+def test_empty_values_fall_through_to_the_next_key():
+    schema = JobSchema(JSEARCH_JOB)
+    assert schema.get(JSEARCH_JOB, "job_description") == "Outbound prospecting."
+
+
+def test_keys_prefer_ids_then_urls_then_title_company_location():
+    assert GENERIC_SCHEMA.key(LINKEDIN_JOB) == "id:li-123"
+    no_id = {key: value for key, value in JSEARCH_JOB.items() if key != "job_id"}
+    assert GENERIC_SCHEMA.key(no_id) == "https://globex.com/careers/9"
+    bare = {"job_title": " BDR ", "employer_name": "Globex", "job_city": "Austin"}
+    assert GENERIC_SCHEMA.key(bare) == "bdr|globex|austin"
+
+
+def test_records_drop_the_raw_payload_unless_asked():
+    record = GENERIC_SCHEMA.record(LINKEDIN_JOB)
+    assert record.key == "id:li-123"
+    assert record.title == "Sales Development Representative"
+    assert record.company == "Acme Inc"
+    assert record.raw is None
+    assert GENERIC_SCHEMA.record(LINKEDIN_JOB, keep_raw=True).raw is LINKEDIN_JOB
+
+
+def test_schemas_are_cached_per_key_set():
+    assert schema_for_jobs([LINKEDIN_JOB]) is schema_for_jobs([dict(LINKEDIN_JOB)])
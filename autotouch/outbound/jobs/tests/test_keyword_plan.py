@@ -0,0 +1,48 @@
+import pytest
+
+from outbound.jobs.keyword_plan import KeywordMatcher, attribute_keywords, plan_keyword_batches
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("We run outbound with Clay.", ["Clay"]),
+        ("Experience with HubSpot workflows and CRMs", ["HubSpot", "CRM"]),
+        ("Owns our sales processes", ["sales process"]),
+        ("Claymation studio", []),
+        ("CRMes are fine", ["CRM"]),
+    ],
+)
+def test_matches_whole_words_and_plurals(text, expected):
+    matcher = KeywordMatcher(["Clay", "HubSpot", "CRM", "sales process"])
+    assert matcher.match(text) == expected
+
+
+def test_matching_is_case_insensitive_and_keeps_keyword_order():
+    matcher = KeywordMatcher(["Apollo", "Clay"])
+    assert matcher.match("CLAY first, then apollo.io") == ["Apollo", "Clay"]
+
+
+def test_overlapping_keywords_all_match():
+    matcher = KeywordMatcher(["sales", "sales ops", "ops"])
+    assert matcher.match("Join our sales ops team") == ["sales", "sales ops", "ops"]
+
+
+def test_punctuation_is_matched_as_its_own_token():
+    matcher = KeywordMatcher(["C++", "C#"])
+    assert matcher.match("Modern C++ only") == ["C++"]
+    assert matcher.match("C# and .NET") == ["C#"]
+    assert matcher.match("Plain C") == []
+
+
+def test_attribution_falls_back_to_the_batch_unless_local():
+    job = {"job_title": "SDR", "description": "Prospecting"}
+    assert attribute_keywords(job, ["Clay", "Apollo"]) == ["Clay", "Apollo"]
+    assert attribute_keywords(job, ["Clay", "Apollo"], local=True) == []
+
+
+def test_batches_respect_keyword_count():
+    keywords = [f"k{i}" for i in range(25)]
+    batches = plan_keyword_batches(keywords, max_keywords=10)
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert sum(batches, []) == keywords
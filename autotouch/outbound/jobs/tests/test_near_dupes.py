@@ -0,0 +1,60 @@
+from outbound.jobs.near_dupes import (
+    NUM_HASHES,
+    find_near_duplicates,
+    merge_near_duplicates,
+    shingles,
+    signature,
+)
+
+BOILERPLATE = (
+    "Acme builds revenue software for modern sales teams. You will research "
+    "accounts, write outbound sequences in Clay and Apollo, book meetings for "
+    "account executives and keep our CRM clean. We offer equity, remote work "
+    "and a generous learning budget for everyone on the team."
+)
+
+
+def _job(title, company="Acme Inc", description=BOILERPLATE):
+    return {"title": title, "organization": company, "description_text": description}
+
+
+def test_signatures_are_stable_and_32_bit():
+    features = shingles(_job("SDR"))
+    sig = signature(features)
+    assert len(sig) == NUM_HASHES
+    assert sig == signature(set(features))
+    assert all(0 <= value <= 0xFFFFFFFF for value in sig)
+
+
+def test_sparse_sets_still_fill_every_bin():
+    sig = signature({1, 2})
+    assert len(sig) == NUM_HASHES
+    assert signature({1, 2}) != signature({1, 3})
+
+
+def test_syndicated_copies_cluster_in_input_order():
+    jobs = {
+        "linkedin": _job("Sales Development Representative"),
+        "other": _job("Account Executive", company="Globex", description="Close deals."),
+        "active": _job("Sales Development Representative", company="ACME, Inc."),
+    }
+    assert find_near_duplicates(jobs) == [["linkedin", "active"]]
+
+
+def test_different_roles_at_one_employer_stay_apart():
+    jobs = {
+        "sdr": _job("Sales Development Representative"),
+        "ae": _job("Senior Account Executive"),
+    }
+    assert find_near_duplicates(jobs) == []
+
+
+def test_merge_folds_sources_and_keywords_into_the_first_job():
+    jobs = {"a": _job("SDR"), "b": _job("SDR", company="Acme")}
+    sources = {"a": {"linkedin"}, "b": {"active_jobs_db"}}
+    keywords = {"a": {"Clay"}, "b": {"Apollo"}}
+    report = merge_near_duplicates(jobs, sources, keywords)
+    assert [entry["kept"] for entry in report] == ["a"]
+    assert list(jobs) == ["a"]
+    assert sources == {"a": {"linkedin", "active_jobs_db"}}
+    assert keywords == {"a": {"Clay", "Apollo"}}
@@ -0,0 +1,49 @@
+from outbound.jobs.outbox import Outbox
+
+
+def _records(count, start=0):
+    return [{"unknown_id": str(i)} for i in range(start, start + count)]
+
+
+def test_resume_after_partial_ack_resends_only_undelivered(tmp_path):
+    outbox = Outbox(tmp_path)
+    numbers = outbox.append(_records(6))
+    # Batches land out of order: the second one before the first.
+    outbox.ack(numbers[3:5])
+    outbox.ack(numbers[:1])
+
+    reopened = Outbox(tmp_path)
+    assert len(reopened) == 3
+    assert [record["unknown_id"] for _, record in reopened.pending()] == ["1", "2", "5"]
+
+
+def test_cursor_moves_over_contiguous_acks(tmp_path):
+    outbox = Outbox(tmp_path)
+    numbers = outbox.append(_records(4))
+    outbox.ack(numbers[2:])
+    assert outbox.next == 0
+    outbox.ack(numbers[:2])
+    assert outbox.next == 4
+    assert len(Outbox(tmp_path)) == 0
+
+
+def test_torn_last_line_is_dropped_on_open(tmp_path):
+    outbox = Outbox(tmp_path)
+    outbox.append(_records(2))
+    segment = next(tmp_path.glob("*.jsonl"))
+    with segment.open("ab") as handle:
+        handle.write(b'{"unknown_id": "tor')
+
+    reopened = Outbox(tmp_path)
+    assert [record["unknown_id"] for _, record in reopened.pending()] == ["0", "1"]
+    reopened.append(_records(1, start=2))
+    assert [record["unknown_id"] for _, record in reopened.pending()] == ["0", "1", "2"]
+
+
+def test_delivered_segments_are_deleted(tmp_path):
+    outbox = Outbox(tmp_path, segment_bytes=1)
+    numbers = outbox.append(_records(3))
+    assert len(list(tmp_path.glob("*.jsonl"))) == 4
+    outbox.ack(numbers[:2])
+    assert [record["unknown_id"] for _, record in outbox.pending()] == ["2"]
+    assert len(list(tmp_path.glob("*.jsonl"))) == 2
@@ -0,0 +1,142 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from shared.integrations.rapidapi.retry import RetryPolicy
+from outbound.jobs.webhook import (
+    ByteBudget,
+    RecordsBody,
+    WebhookSender,
+    batches_by_bytes,
+    encode_record,
+)
+
+
+class Ingest(BaseHTTPRequestHandler):
+    """413 for more than two records, 400 for any record marked bad."""
+
+    def do_POST(self):
+        server = self.server
+        chunked = (self.headers.get("Transfer-Encoding") or "").lower() == "chunked"
+        gzipped = self.headers.get("Content-Encoding") == "gzip"
+        if chunked and not server.accept_chunked:
+            return self._reply(411)
+        if gzipped and not server.accept_gzip:
+            self.close_connection = True
+            return self._reply(415)
+        body = self._read_chunked() if chunked else self.rfile.read(int(self.headers["Content-Length"]))
+        records = json.loads(gzip.decompress(body) if gzipped else body)["records"]
+        server.posts.append((chunked, gzipped, [record["unknown_id"] for record in records]))
+        if len(records) > 2:
+            return self._reply(413)
+        self._reply(400 if any(record.get("bad") for record in records) else 200)
+
+    def _read_chunked(self):
+        data = b""
+        while True:
+            size = int(self.rfile.readline().strip(), 16)
+            chunk = self.rfile.read(size + 2)[:-2]
+            if not size:
+                return data
+            data += chunk
+
+    def _reply(self, status):
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ingest():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Ingest)
+    server.accept_chunked = True
+    server.accept_gzip = True
+    server.posts = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _sender(server, **kwargs):
+    return WebhookSender(
+        f"http://127.0.0.1:{server.server_port}/ingest",
+        "token",
+        retry_policy=RetryPolicy(methods=frozenset({"POST"}), base_delay=0.01),
+        **kwargs,
+    )
+
+
+def _records(count, bad=()):
+    return [{"unknown_id": str(i), "bad": i in bad} for i in range(count)]
+
+
+def test_body_streams_the_same_json_it_encodes():
+    records = _records(3)
+    body = RecordsBody(records, compress=False)
+    assert b"".join(body) == body.encoded()
+    assert body.length() == len(body.encoded())
+    assert json.loads(body.encoded()) == {"records": records}
+    assert gzip.decompress(RecordsBody(records, compress=True).encoded()) == body.encoded()
+
+
+def test_plain_json_is_sent_with_content_length(ingest):
+    with _sender(ingest) as sender:
+        report = sender.send([_records(2)])
+    assert report == {"sent": 2, "batches": 1, "failed": []}
+    assert ingest.posts == [(False, False, ["0", "1"])]
+
+
+def test_split_413_batches_report_only_undelivered_records(ingest):
+    delivered = []
+    with _sender(ingest) as sender:
+        report = sender.send([_records(8, bad={5})], on_delivered=delivered.append)
+    assert [record["unknown_id"] for batch in delivered for record in batch] == [
+        "0", "1", "2", "3", "6", "7"
+    ]
+    assert report["sent"] == 6
+    assert report["batches"] == 0
+    (failure,) = report["failed"]
+    assert failure["records"] == 2
+    assert failure["unknown_ids"] == ["4", "5"]
+
+
+def test_gzip_falls_back_to_content_length_after_411(ingest):
+    ingest.accept_chunked = False
+    with _sender(ingest, gzip=True) as sender:
+        report = sender.send([_records(2), _records(1)])
+        assert not sender.chunked
+    assert report["sent"] == 3
+    assert [post[:2] for post in ingest.posts] == [(False, True), (False, True)]
+
+
+def test_gzip_falls_back_to_plain_json_after_415(ingest):
+    ingest.accept_gzip = False
+    with _sender(ingest, gzip=True) as sender:
+        report = sender.send([_records(2)])
+        assert not sender.gzip
+    assert report["sent"] == 2
+    assert ingest.posts == [(False, False, ["0", "1"])]
+
+
+def test_batches_stay_under_the_byte_budget():
+    records = [{"unknown_id": str(i), "text": "x" * 100} for i in range(50)]
+    budget = ByteBudget(initial=1000)
+    batches = list(batches_by_bytes(records, budget, max_records=100))
+    assert sum(batches, []) == records
+    assert len(batches) > 1
+    for batch in batches:
+        assert sum(len(encode_record(record)) + 1 for record in batch) <= 1000
+
+
+def test_budget_never_shrinks_below_a_small_initial_size():
+    budget = ByteBudget(initial=1000)
+    for _ in range(5):
+        budget.observe(0.1, 1000, ok=False)
+    assert budget.bytes == 1000
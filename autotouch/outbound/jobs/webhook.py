@@ -0,0 +1,437 @@
+import http.client
+import json
+import time
+import urllib.parse
+import zlib
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from shared.integrations.rapidapi.metrics import MetricsRegistry, get_default_registry
+from shared.integrations.rapidapi.retry import CircuitBreakerRegistry, CircuitOpenError, RetryPolicy
+from shared.integrations.rapidapi.transport import ConnectionFactory, RapidApiTransport, RequestBody
+
+# The Autotouch table the job signals are sent to by default.
+DEFAULT_WEBHOOK_URL = (
+    "https://app.autotouch.ai/api/webhooks/tables/697a500b57002fdbff95a9cb/ingest"
+)
+DEFAULT_CONCURRENCY = 4
+DEFAULT_BATCH_BYTES = 1024 * 1024
+DEFAULT_TARGET_SECONDS = 2.0
+# Seconds the webhook may stay unreachable (circuit open) before batches
+# waiting on it fail.
+DEFAULT_MAX_OUTAGE = 120.0
+GZIP_LEVEL = 6
+# Encoded records are gathered into chunks of about this size before being
+# written, so a batch is never held in memory as one string.
+BODY_CHUNK_BYTES = 64 * 1024
+# Ingest upserts on unknown_id, so replaying a batch is harmless.
+_RETRY_METHODS = frozenset({"POST"})
+# Poll interval while another batch holds the half-open probe.
+_PROBE_POLL = 0.1
+
+
+def chunked(items: List[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any]]]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    return json.dumps(record, separators=(",", ":")).encode("utf-8")
+
+
+class RecordsBody:
+    """``{"records": [...]}`` encoded record by record as the request is sent.
+
+    Re-iterable, so a retried request replays it. With ``compress`` the
+    stream is gzipped on the fly. After a full pass ``size`` holds the JSON
+    length and ``wire_size`` the bytes actually sent. ``length()`` counts
+    the uncompressed JSON ahead of sending, so a plain body can still be
+    streamed with Content-Length; ``encoded()`` returns the whole body.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], compress: bool = False) -> None:
+        self.records = records
+        self.compress = compress
+        self.size = 0
+        self.wire_size = 0
+
+    def _pieces(self) -> Iterator[bytes]:
+        yield b'{"records":['
+        for index, record in enumerate(self.records):
+            yield b"," + encode_record(record) if index else encode_record(record)
+        yield b"]}"
+
+    def __iter__(self) -> Iterator[bytes]:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31) if self.compress else None
+        size = wire = 0
+        buffer: List[bytes] = []
+        buffered = 0
+        for piece in self._pieces():
+            size += len(piece)
+            if compressor is not None:
+                piece = compressor.compress(piece)
+            buffer.append(piece)
+            buffered += len(piece)
+            if buffered >= BODY_CHUNK_BYTES:
+                chunk = b"".join(buffer)
+                wire += len(chunk)
+                yield chunk
+                buffer, buffered = [], 0
+        if compressor is not None:
+            buffer.append(compressor.flush())
+        chunk = b"".join(buffer)
+        if chunk:
+            wire += len(chunk)
+            yield chunk
+        self.size, self.wire_size = size, wire
+
+    def length(self) -> int:
+        return sum(len(piece) for piece in self._pieces())
+
+    def encoded(self) -> bytes:
+        return b"".join(self)
+
+
+class ByteBudget:
+    """Target request size for webhook batches, tuned AIMD-style.
+
+    A batch that lands faster than ``target_seconds`` and used most of the
+    budget grows it by ``initial / 8``; a slow one shrinks it by a quarter
+    and an error (429/5xx/413/timeout) halves it. The budget stays within
+    ``initial / 8`` .. ``initial * 8``, but does not shrink below 16 KiB
+    unless ``initial`` is already smaller. Thread-safe, since
+    concurrent POSTs report back from worker threads.
+    """
+
+    def __init__(
+        self,
+        initial: int = DEFAULT_BATCH_BYTES,
+        target_seconds: float = DEFAULT_TARGET_SECONDS,
+        adaptive: bool = True,
+    ) -> None:
+        self.bytes = initial
+        self.target_seconds = target_seconds
+        self.adaptive = adaptive
+        self.minimum = min(initial, max(16 * 1024, initial // 8))
+        self.maximum = max(self.minimum, initial * 8)
+        self.step = max(1, initial // 8)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, size: int, ok: bool) -> None:
+        if not self.adaptive:
+            return
+        with self._lock:
+            if not ok:
+                self.bytes = max(self.minimum, self.bytes // 2)
+            elif seconds > self.target_seconds:
+                self.bytes = max(self.minimum, self.bytes * 3 // 4)
+            elif size >= self.bytes // 2:
+                # Small batches (the tail of a run) say nothing about capacity.
+                self.bytes = min(self.maximum, self.bytes + self.step)
+
+
+def batches_by_bytes(
+    records: Iterable[Dict[str, Any]],
+    budget: ByteBudget,
+    max_records: Optional[int] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Group records into batches whose encoded size stays under the budget.
+
+    The budget is read as each batch starts, so feedback from batches
+    already in flight shapes the next one. A record larger than the budget
+    goes out alone.
+    """
+    batch: List[Dict[str, Any]] = []
+    size = 0
+    limit = budget.bytes
+    for record in records:
+        record_size = len(encode_record(record)) + 1
+        if batch and (size + record_size > limit or (max_records and len(batch) >= max_records)):
+            yield batch
+            batch, size, limit = [], 0, budget.bytes
+        batch.append(record)
+        size += record_size
+    if batch:
+        yield batch
+
+
+class PartialDelivery(RuntimeError):
+    """Part of a batch split after a 413 landed and part did not."""
+
+    def __init__(
+        self, delivered: List[Dict[str, Any]], failed: List[Dict[str, Any]], error: str
+    ) -> None:
+        super().__init__(error)
+        self.delivered = delivered
+        self.failed = failed
+
+
+def _plain_http(host: str, timeout: float) -> http.client.HTTPConnection:
+    return http.client.HTTPConnection(host, timeout=timeout)
+
+
+class WebhookSender:
+    """Posts record batches to one webhook over pooled keep-alive connections.
+
+    Up to ``concurrency`` batches are in flight at once. Each batch is
+    retried on 429/5xx and network errors with the shared jittered backoff.
+    Once the webhook keeps erroring a circuit breaker trips, and batches wait
+    for its half-open probe instead of failing; only after ``max_outage``
+    seconds without a response do they fail fast. A batch rejected with 413
+    is split in half and resent; if only some halves land, ``post`` raises
+    ``PartialDelivery``.
+    With a ``budget``, every POST reports its latency and outcome to it.
+    Bodies are encoded record by record as they are sent: plain JSON with
+    Content-Length (from a counting pass), gzip with chunked transfer
+    encoding. After a 411 this sender buffers gzipped bodies instead, and
+    after a 415 it posts plain JSON. Use as a context manager (or call ``close()``).
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retry_policy: Optional[RetryPolicy] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        timeout: float = 30,
+        connection_factory: Optional[ConnectionFactory] = None,
+        budget: Optional[ByteBudget] = None,
+        gzip: bool = False,
+        max_outage: float = DEFAULT_MAX_OUTAGE,
+    ) -> None:
+        parsed = urllib.parse.urlsplit(url)
+        self.host = parsed.netloc
+        self.path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+        self.token = token
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.budget = budget
+        self.gzip = gzip
+        self.chunked = True
+        self.max_outage = max_outage
+        self._outage_since: Optional[float] = None
+        self._lock = threading.Lock()
+        if connection_factory is None and parsed.scheme == "http":
+            connection_factory = _plain_http
+        self.transport = RapidApiTransport(
+            max_connections_per_host=self.concurrency,
+            retry_policy=retry_policy or RetryPolicy(methods=_RETRY_METHODS),
+            circuit_breakers=CircuitBreakerRegistry(),
+            metrics=metrics or get_default_registry(),
+            connection_factory=connection_factory,
+        )
+
+    def __enter__(self) -> "WebhookSender":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.transport.close()
+
+    def _request(self, body: RequestBody, headers: Dict[str, str]) -> Tuple[int, bytes, float]:
+        """POST ``body``, waiting out an open circuit rather than failing.
+
+        Returns the status, response body and seconds taken since the last wait.
+        """
+        while True:
+            started = time.perf_counter()
+            try:
+                status, _, data = self.transport.request(
+                    self.host,
+                    "POST",
+                    self.path,
+                    body=body,
+                    headers=headers,
+                    timeout=self.timeout,
+                )
+            except CircuitOpenError as exc:
+                with self._lock:
+                    if self._outage_since is None:
+                        self._outage_since = time.monotonic()
+                    outage = time.monotonic() - self._outage_since
+                if outage >= self.max_outage:
+                    raise
+                time.sleep(min(max(exc.retry_in, _PROBE_POLL), self.max_outage - outage))
+                continue
+            if status < 500:
+                with self._lock:
+                    self._outage_since = None
+            return status, data, time.perf_counter() - started
+
+    def post(self, records: List[Dict[str, Any]]) -> None:
+        """Post one batch, retrying transient failures; raises once it gives up."""
+        with self._lock:
+            compress = self.gzip
+            streamed = compress and self.chunked
+        body = RecordsBody(records, compress=compress)
+        headers = {
+            "Content-Type": "application/json",
+            "X-Autotouch-Token": self.token,
+        }
+        payload: RequestBody = body
+        if not compress:
+            headers["Content-Length"] = str(body.length())
+        else:
+            headers["Content-Encoding"] = "gzip"
+            if not streamed:
+                payload = body.encoded()
+        status: Any = None
+        seconds = 0.0
+        try:
+            status, data, seconds = self._request(payload, headers)
+        finally:
+            if self.budget is not None and status not in (411, 415):
+                self.budget.observe(seconds, body.size, status == 200)
+        if status == 411 and streamed:
+            with self._lock:
+                self.chunked = False
+            self.post(records)
+            return
+        if status == 415 and compress:
+            with self._lock:
+                self.gzip = False
+            self.post(records)
+            return
+        if status == 413 and len(records) > 1:
+            self._post_split(records)
+            return
+        if status != 200:
+            body = data.decode("utf-8", errors="replace")
+            raise RuntimeError(f"Webhook returned {status}: {body}")
+
+    def _post_split(self, records: List[Dict[str, Any]]) -> None:
+        """Post both halves of ``records``, tracking which of them landed."""
+        middle = len(records) // 2
+        delivered: List[Dict[str, Any]] = []
+        failed: List[Dict[str, Any]] = []
+        errors: List[str] = []
+        for half in (records[:middle], records[middle:]):
+            try:
+                self.post(half)
+            except PartialDelivery as exc:
+                delivered.extend(exc.delivered)
+                failed.extend(exc.failed)
+                errors.append(str(exc))
+            except (RuntimeError, OSError, http.client.HTTPException) as exc:
+                failed.extend(half)
+                errors.append(str(exc))
+            else:
+                delivered.extend(half)
+        if failed:
+            raise PartialDelivery(delivered, failed, errors[0])
+
+    def dispatch(
+        self, on_delivered: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+    ) -> "BatchDispatch":
+        """A ``BatchDispatch`` posting through this sender."""
+        return BatchDispatch(self, on_delivered)
+
+    def send(
+        self,
+        batches: Iterable[List[Dict[str, Any]]],
+        on_delivered: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    ) -> Dict[str, Any]:
+        """Post ``batches`` concurrently; a failed batch does not stop the rest.
+
+        ``batches`` is consumed lazily, one batch per free slot, so a
+        generator such as ``batches_by_bytes`` sees the latest budget.
+        ``on_delivered(batch)`` runs on the calling thread as each batch
+        lands. Returns the ``BatchDispatch.finish`` report.
+        """
+        with self.dispatch(on_delivered) as dispatch:
+            pending = iter(batches)
+            while True:
+                dispatch.wait_for_slot()
+                batch = next(pending, None)
+                if batch is None:
+                    break
+                dispatch.submit(batch)
+            return dispatch.finish()
+
+
+class BatchDispatch:
+    """Batches handed to a ``WebhookSender`` one at a time, ``concurrency`` in flight.
+
+    ``submit`` blocks while every slot is busy, so a producer such as the
+    streaming pipeline is throttled by the webhook. ``on_delivered(batch)``
+    runs on the submitting thread (inside ``submit``, ``wait_for_slot`` or
+    ``finish``); a failed batch is recorded and does not stop the rest. When
+    a split batch lands only in part, the delivered records are passed to
+    ``on_delivered`` and only the rest are recorded as failed.
+    """
+
+    def __init__(
+        self,
+        sender: WebhookSender,
+        on_delivered: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    ) -> None:
+        self.sender = sender
+        self.on_delivered = on_delivered
+        self.report: Dict[str, Any] = {"sent": 0, "batches": 0, "failed": []}
+        self._submitted = 0
+        self._in_flight: Dict["Future[None]", Tuple[int, List[Dict[str, Any]]]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=sender.concurrency)
+
+    def __enter__(self) -> "BatchDispatch":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.finish()
+
+    def _collect(self, done: Iterable["Future[None]"]) -> None:
+        for future in done:
+            index, batch = self._in_flight.pop(future)
+            failed = batch
+            try:
+                future.result()
+            except PartialDelivery as exc:
+                failed = exc.failed
+                error = str(exc)
+                if exc.delivered:
+                    self.report["sent"] += len(exc.delivered)
+                    if self.on_delivered is not None:
+                        self.on_delivered(exc.delivered)
+            except (RuntimeError, OSError, http.client.HTTPException) as exc:
+                error = str(exc)
+            else:
+                failed = []
+            if failed:
+                self.report["failed"].append(
+                    {
+                        "batch": index,
+                        "records": len(failed),
+                        "error": error,
+                        "unknown_ids": [record.get("unknown_id") for record in failed],
+                    }
+                )
+                continue
+            self.report["sent"] += len(batch)
+            self.report["batches"] += 1
+            if self.on_delivered is not None:
+                self.on_delivered(batch)
+
+    def wait_for_slot(self) -> None:
+        """Block until fewer than ``concurrency`` batches are in flight."""
+        while len(self._in_flight) >= self.sender.concurrency:
+            done, _ = wait(self._in_flight, return_when=FIRST_COMPLETED)
+            self._collect(done)
+
+    def submit(self, batch: List[Dict[str, Any]]) -> None:
+        self.wait_for_slot()
+        self._in_flight[self._executor.submit(self.sender.post, batch)] = (self._submitted, batch)
+        self._submitted += 1
+
+    def finish(self) -> Dict[str, Any]:
+        """Wait for the batches in flight and return record/batch counts plus,
+        in batch order, the batches that failed (index, size, error and their
+        unknown_ids). Safe to call more than once.
+        """
+        if self._in_flight:
+            self._collect(wait(self._in_flight).done)
+        self._executor.shutdown()
+        self.report["failed"].sort(key=lambda failure: failure["batch"])
+        return self.report
@@ -0,0 +1,12 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+# Same import roots the scripts set up: ``shared`` here, ``outbound`` under autotouch/.
+for path in (ROOT, ROOT / "autotouch"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+# Archived one-off scripts, some named *_test.py; not part of the suite.
+collect_ignore = ["autotouch/docs"]
@@ -0,0 +1,93 @@
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from shared.integrations.rapidapi.transport import DEFAULT_MAX_CONNECTIONS_PER_HOST
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY_PER_HOST = DEFAULT_MAX_CONNECTIONS_PER_HOST
+
+
+class ThreadPoolFanout:
+    """Fans blocking client calls out to a thread pool, bounded per host.
+
+    This is not non-blocking IO: each call still holds a worker thread for
+    the whole request through the pooled sync transport. It only keeps the
+    event loop free while it waits, with up to ``max_concurrency_per_host``
+    calls per host in flight per event loop.
+    """
+
+    def __init__(
+        self,
+        max_concurrency_per_host: int = DEFAULT_MAX_CONCURRENCY_PER_HOST,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        if max_concurrency_per_host < 1:
+            raise ValueError("max_concurrency_per_host must be >= 1")
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or max_concurrency_per_host * 4,
+            thread_name_prefix="rapidapi",
+        )
+        # asyncio semaphores belong to one loop, so they are kept per loop.
+        self._semaphores: "weakref.WeakKeyDictionary[Any, Dict[str, asyncio.Semaphore]]"
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._semaphores.setdefault(loop, {})
+            semaphore = semaphores.get(host)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrency_per_host)
+                semaphores[host] = semaphore
+            return semaphore
+
+    async def run(self, host: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        async with self._semaphore(host):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+class AsyncRapidApiClient:
+    """Base for async wrappers around a sync RapidAPI client.
+
+    Calls run on a ``ThreadPoolFanout``; the sync client does the IO.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY_PER_HOST,
+        runner: Optional[ThreadPoolFanout] = None,
+    ) -> None:
+        self.client = client
+        self._owns_runner = runner is None
+        self.runner = runner or ThreadPoolFanout(max_concurrency_per_host=max_concurrency)
+
+    @property
+    def host(self) -> str:
+        return self.client.host
+
+    async def _call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await self.runner.run(self.client.host, func, *args, **kwargs)
+
+    async def aclose(self) -> None:
+        if self._owns_runner:
+            await asyncio.get_running_loop().run_in_executor(None, self.runner.close)
+
+    async def __aenter__(self) -> "AsyncRapidApiClient":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
@@ -1,9 +1,14 @@
-import http.client
 import json
 import os
-import urllib.parse
 from typing import Any, Dict, Optional, Tuple
 
+from shared.integrations.rapidapi.codec import loads_json
+from shared.integrations.rapidapi.transport import (
+    RapidApiTransport,
+    build_path,
+    get_default_transport,
+)
+
 DEFAULT_APOLLO_HOST = "apollo-io-no-cookies-required.p.rapidapi.com"
 
 
@@ -13,12 +18,14 @@ class RapidApiApolloJobTitleClient:
         api_key: Optional[str] = None,
         host: Optional[str] = None,
         timeout: int = 30,
+        transport: Optional[RapidApiTransport] = None,
     ) -> None:
         self.api_key = api_key or os.getenv("RAPID_API_KEY") or os.getenv("RAPIDAPI_KEY")
         if not self.api_key:
             raise ValueError("Missing RAPID_API_KEY (or RAPIDAPI_KEY) in environment")
         self.host = host or os.getenv("RAPIDAPI_APOLLO_HOST") or DEFAULT_APOLLO_HOST
         self.timeout = timeout
+        self.transport = transport or get_default_transport()
 
     def _headers(self, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
         headers = {
@@ -37,9 +44,7 @@ class RapidApiApolloJobTitleClient:
         body: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
     ) -> Tuple[int, Dict[str, str], bytes]:
-        if params:
-            encoded = urllib.parse.urlencode(params, doseq=True)
-            path = f"{path}?{encoded}"
+        path = build_path(path, params)
 
         payload = None
         merged_headers = headers or {}
@@ -47,11 +52,14 @@ class RapidApiApolloJobTitleClient:
             payload = json.dumps(body).encode("utf-8")
             merged_headers = {"Content-Type": "application/json", **merged_headers}
 
-        conn = http.client.HTTPSConnection(self.host, timeout=self.timeout)
-        conn.request(method, path, body=payload, headers=self._headers(merged_headers))
-        res = conn.getresponse()
-        data = res.read()
-        return res.status, dict(res.getheaders()), data
+        return self.transport.request(
+            self.host,
+            method,
+            path,
+            body=payload,
+            headers=self._headers(merged_headers),
+            timeout=self.timeout,
+        )
 
     def _request_json(
         self,
@@ -61,12 +69,7 @@ class RapidApiApolloJobTitleClient:
         body: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         status, headers, data = self._request(method, path, params=params, body=body)
-        text = data.decode("utf-8", errors="replace")
-        try:
-            payload = json.loads(text)
-        except json.JSONDecodeError:
-            payload = {"raw": text}
-        return {"status": status, "headers": headers, "data": payload}
+        return {"status": status, "headers": headers, "data": loads_json(data)}
 
     def suggestion_job_title(self, query: str) -> Dict[str, Any]:
         if not query:
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import urllib.parse
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL = 3600.0
+
+# Seconds a cached response stays fresh, by endpoint path.
+DEFAULT_TTLS: Dict[str, float] = {
+    "/active-jb-24h": 15 * 60,
+    "/active-ats-24h": 15 * 60,
+    "/active-jb-7d": 6 * 3600,
+    "/active-ats-7d": 6 * 3600,
+    "/search": 3600,
+    "/enrich-lead": 7 * 86400,
+    "/suggestion_job_title": 7 * 86400,
+}
+
+CachedResponse = Tuple[int, Dict[str, str], bytes]
+
+
+def canonical_path(path: str) -> str:
+    """Sort query parameters so equivalent requests share a cache entry."""
+    base, _, query = path.partition("?")
+    if not query:
+        return base
+    pairs = sorted(urllib.parse.parse_qsl(query, keep_blank_values=True))
+    return f"{base}?{urllib.parse.urlencode(pairs)}"
+
+
+class ResponseCache:
+    """On-disk, size-bounded LRU cache of successful GET responses.
+
+    Entries live in a single SQLite file, keyed on host + canonical path
+    (the urlencoded ``_clean_params`` output with sorted keys). Bodies are
+    stored zlib-compressed. ``ttls`` maps endpoint paths to freshness in
+    seconds; once ``max_bytes`` is exceeded the least recently read entries
+    are evicted.
+    """
+
+    def __init__(
+        self,
+        path: os.PathLike,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " status INTEGER NOT NULL,"
+            " headers TEXT NOT NULL,"
+            " body BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)"
+        )
+        self._db.commit()
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """Build the cache from ``RAPIDAPI_CACHE_DIR`` (opt-in), else None."""
+        directory = os.getenv("RAPIDAPI_CACHE_DIR")
+        if not directory:
+            return None
+        max_mb = os.getenv("RAPIDAPI_CACHE_MAX_MB")
+        max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+        return cls(Path(directory) / "responses.sqlite3", max_bytes=max_bytes)
+
+    def ttl_for(self, path: str) -> float:
+        return self.ttls.get(path.partition("?")[0], self.default_ttl)
+
+    def key(self, host: str, path: str) -> str:
+        raw = f"{host.lower()} {canonical_path(path)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(
+        self, host: str, path: str, max_age: Optional[float] = None
+    ) -> Optional[CachedResponse]:
+        """Return a fresh entry; with ``max_age``, only one stored that recently."""
+        key = self.key(host, path)
+        now = self._clock()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, headers, body, expires_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            status, headers, body, expires_at = row
+            if expires_at <= now:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            if max_age is not None and expires_at - self.ttl_for(path) < now - max_age:
+                return None
+            self._db.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._db.commit()
+        return status, json.loads(headers), zlib.decompress(body)
+
+    def put(
+        self,
+        host: str,
+        path: str,
+        status: int,
+        headers: Dict[str, str],
+        data: bytes,
+        ttl: Optional[float] = None,
+    ) -> None:
+        ttl = self.ttl_for(path) if ttl is None else ttl
+        if ttl <= 0:
+            return
+        body = zlib.compress(data, 6)
+        now = self._clock()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, status, headers, body, size, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.key(host, path),
+                    status,
+                    json.dumps(headers, separators=(",", ":")),
+                    body,
+                    len(body),
+                    now + ttl,
+                    now,
+                ),
+            )
+            self._evict(now)
+            self._db.commit()
+
+    def _evict(self, now: float) -> None:
+        self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        )
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
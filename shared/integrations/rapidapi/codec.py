@@ -0,0 +1,61 @@
+import json
+import zlib
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # optional faster backend
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+ACCEPT_ENCODING = "gzip, deflate"
+# These describe the body as sent, not the decoded bytes we keep.
+_WIRE_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+def decompressor(content_encoding: Optional[str]) -> Optional[Any]:
+    """Return a streaming zlib decompressor for the response encoding, if any."""
+    encoding = (content_encoding or "").strip().lower()
+    if encoding in ("gzip", "x-gzip"):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        # Auto-detect zlib-wrapped vs. raw deflate (servers send either).
+        return _DeflateDecompressor()
+    return None
+
+
+def decoded_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """``headers`` without those that only held for the encoded wire body."""
+    return {k: v for k, v in headers.items() if k.lower() not in _WIRE_HEADERS}
+
+
+class _DeflateDecompressor:
+    def __init__(self) -> None:
+        self._obj: Optional[Any] = None
+
+    def decompress(self, chunk: bytes) -> bytes:
+        if self._obj is None:
+            try:
+                self._obj = zlib.decompressobj(zlib.MAX_WBITS)
+                return self._obj.decompress(chunk)
+            except zlib.error:
+                self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._obj.decompress(chunk)
+
+    def flush(self) -> bytes:
+        return self._obj.flush() if self._obj is not None else b""
+
+
+def loads_json(data: bytes) -> Any:
+    """Parse JSON straight from the response bytes.
+
+    Uses orjson when installed, else ``json.loads`` on the bytes (no
+    intermediate ``str``). Undecodable bodies come back as ``{"raw": text}``.
+    """
+    try:
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+    except ValueError:
+        return {"raw": data.decode("utf-8", errors="replace")}
@@ -1,10 +1,18 @@
-import http.client
 import json
 import os
-import urllib.parse
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from shared.integrations.rapidapi.codec import loads_json
+from shared.integrations.rapidapi.jobs.pagination import iter_offset_pages
+from shared.integrations.rapidapi.transport import (
+    RapidApiTransport,
+    build_path,
+    get_default_transport,
+)
 
 DEFAULT_ACTIVE_JOBS_HOST = "active-jobs-db.p.rapidapi.com"
+JOBS_24H_PATH = "/active-ats-24h"
+JOBS_7D_PATH = "/active-ats-7d"
 
 
 def _bool_param(value: Optional[bool]) -> Optional[str]:
@@ -33,12 +41,14 @@ class RapidApiActiveJobsDbClient:
         api_key: Optional[str] = None,
         host: Optional[str] = None,
         timeout: int = 30,
+        transport: Optional[RapidApiTransport] = None,
     ) -> None:
         self.api_key = api_key or os.getenv("RAPID_API_KEY") or os.getenv("RAPIDAPI_KEY")
         if not self.api_key:
             raise ValueError("Missing RAPID_API_KEY (or RAPIDAPI_KEY) in environment")
         self.host = host or os.getenv("RAPIDAPI_ACTIVE_JOBS_HOST") or DEFAULT_ACTIVE_JOBS_HOST
         self.timeout = timeout
+        self.transport = transport or get_default_transport()
 
     def _headers(self, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
         headers = {
@@ -57,9 +67,7 @@ class RapidApiActiveJobsDbClient:
         body: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
     ) -> Tuple[int, Dict[str, str], bytes]:
-        if params:
-            encoded = urllib.parse.urlencode(params, doseq=True)
-            path = f"{path}?{encoded}"
+        path = build_path(path, params)
 
         payload = None
         merged_headers = headers or {}
@@ -67,11 +75,14 @@ class RapidApiActiveJobsDbClient:
             payload = json.dumps(body).encode("utf-8")
             merged_headers = {"Content-Type": "application/json", **merged_headers}
 
-        conn = http.client.HTTPSConnection(self.host, timeout=self.timeout)
-        conn.request(method, path, body=payload, headers=self._headers(merged_headers))
-        res = conn.getresponse()
-        data = res.read()
-        return res.status, dict(res.getheaders()), data
+        return self.transport.request(
+            self.host,
+            method,
+            path,
+            body=payload,
+            headers=self._headers(merged_headers),
+            timeout=self.timeout,
+        )
 
     def _request_json(
         self,
@@ -81,12 +92,47 @@ class RapidApiActiveJobsDbClient:
         body: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         status, headers, data = self._request(method, path, params=params, body=body)
-        text = data.decode("utf-8", errors="replace")
-        try:
-            payload = json.loads(text)
-        except json.JSONDecodeError:
-            payload = {"raw": text}
-        return {"status": status, "headers": headers, "data": payload}
+        return {"status": status, "headers": headers, "data": loads_json(data)}
+
+    def _cached_json(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        max_age: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        hit = self.transport.cached(self.host, build_path(path, params), max_age=max_age)
+        if hit is None:
+            return None
+        status, headers, data = hit
+        return {"status": status, "headers": headers, "data": loads_json(data)}
+
+    def cached_jobs_7d(self, max_age: Optional[float] = None, **filters: Any) -> Optional[Dict[str, Any]]:
+        """Cached ``get_jobs_7d`` response for the same filters, or None (no request)."""
+        return self._cached_json(JOBS_7D_PATH, _clean_params(filters), max_age=max_age)
+
+    def iter_jobs(
+        self,
+        window: str = "24h",
+        page_size: int = 100,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+        **filters: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield jobs one at a time across ``offset`` pages of the window.
+
+        Takes the same filters as ``get_jobs_24h``/``get_jobs_7d`` (``limit``
+        is replaced by ``page_size``; ``offset`` sets the starting offset).
+        """
+        get_page = self.get_jobs_7d if window == "7d" else self.get_jobs_24h
+        filters.pop("limit", None)
+        start_offset = filters.pop("offset", None) or 0
+        return iter_offset_pages(
+            lambda offset, limit: get_page(offset=offset, limit=limit, **filters),
+            page_size=page_size,
+            max_items=max_items,
+            start_offset=start_offset,
+            prefetch=prefetch,
+        )
 
     def get_jobs_24h(
         self,
@@ -161,7 +207,7 @@ class RapidApiActiveJobsDbClient:
                 "ai_education_requirements_filter": ai_education_requirements_filter,
             }
         )
-        return self._request_json("GET", "/active-ats-24h", params=params)
+        return self._request_json("GET", JOBS_24H_PATH, params=params)
 
     def get_jobs_7d(
         self,
@@ -236,4 +282,4 @@ class RapidApiActiveJobsDbClient:
                 "ai_education_requirements_filter": ai_education_requirements_filter,
             }
         )
-        return self._request_json("GET", "/active-ats-7d", params=params)
+        return self._request_json("GET", JOBS_7D_PATH, params=params)
@@ -0,0 +1,74 @@
+from typing import Any, Dict, Optional
+
+from shared.integrations.rapidapi.aio import (
+    DEFAULT_MAX_CONCURRENCY_PER_HOST,
+    AsyncRapidApiClient,
+    ThreadPoolFanout,
+)
+from shared.integrations.rapidapi.jobs.active_jobs_db import RapidApiActiveJobsDbClient
+from shared.integrations.rapidapi.jobs.client import RapidApiLinkedInJobsClient
+from shared.integrations.rapidapi.jobs.jsearch import RapidApiJSearchClient
+from shared.integrations.rapidapi.transport import RapidApiTransport
+
+
+class AsyncRapidApiLinkedInJobsClient(AsyncRapidApiClient):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        host: Optional[str] = None,
+        timeout: int = 30,
+        transport: Optional[RapidApiTransport] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY_PER_HOST,
+        runner: Optional[ThreadPoolFanout] = None,
+    ) -> None:
+        client = RapidApiLinkedInJobsClient(
+            api_key=api_key, host=host, timeout=timeout, transport=transport
+        )
+        super().__init__(client, max_concurrency=max_concurrency, runner=runner)
+
+    async def get_jobs_24h(self, **params: Any) -> Dict[str, Any]:
+        return await self._call(self.client.get_jobs_24h, **params)
+
+    async def get_jobs_7d(self, **params: Any) -> Dict[str, Any]:
+        return await self._call(self.client.get_jobs_7d, **params)
+
+
+class AsyncRapidApiActiveJobsDbClient(AsyncRapidApiClient):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        host: Optional[str] = None,
+        timeout: int = 30,
+        transport: Optional[RapidApiTransport] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY_PER_HOST,
+        runner: Optional[ThreadPoolFanout] = None,
+    ) -> None:
+        client = RapidApiActiveJobsDbClient(
+            api_key=api_key, host=host, timeout=timeout, transport=transport
+        )
+        super().__init__(client, max_concurrency=max_concurrency, runner=runner)
+
+    async def get_jobs_24h(self, **params: Any) -> Dict[str, Any]:
+        return await self._call(self.client.get_jobs_24h, **params)
+
+    async def get_jobs_7d(self, **params: Any) -> Dict[str, Any]:
+        return await self._call(self.client.get_jobs_7d, **params)
+
+
+class AsyncRapidApiJSearchClient(AsyncRapidApiClient):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        host: Optional[str] = None,
+        timeout: int = 30,
+        transport: Optional[RapidApiTransport] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY_PER_HOST,
+        runner: Optional[ThreadPoolFanout] = None,
+    ) -> None:
+        client = RapidApiJSearchClient(
+            api_key=api_key, host=host, timeout=timeout, transport=transport
+        )
+        super().__init__(client, max_concurrency=max_concurrency, runner=runner)
+
+    async def search_jobs(self, query: str, **params: Any) -> Dict[str, Any]:
+        return await self._call(self.client.search_jobs, query, **params)
@@ -1,9 +1,14 @@
-import http.client
 import json
 import os
-import urllib.parse
 from typing import Any, Dict, Optional, Tuple
 
+from shared.integrations.rapidapi.codec import loads_json
+from shared.integrations.rapidapi.transport import (
+    RapidApiTransport,
+    build_path,
+    get_default_transport,
+)
+
 DEFAULT_JSEARCH_HOST = "jsearch.p.rapidapi.com"
 
 
@@ -33,12 +38,14 @@ class RapidApiJSearchClient:
         api_key: Optional[str] = None,
         host: Optional[str] = None,
         timeout: int = 30,
+        transport: Optional[RapidApiTransport] = None,
     ) -> None:
         self.api_key = api_key or os.getenv("RAPID_API_KEY") or os.getenv("RAPIDAPI_KEY")
         if not self.api_key:
             raise ValueError("Missing RAPID_API_KEY (or RAPIDAPI_KEY) in environment")
         self.host = host or os.getenv("RAPIDAPI_JSEARCH_HOST") or DEFAULT_JSEARCH_HOST
         self.timeout = timeout
+        self.transport = transport or get_default_transport()
 
     def _headers(self, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
         headers = {
@@ -57,9 +64,7 @@ class RapidApiJSearchClient:
         body: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
     ) -> Tuple[int, Dict[str, str], bytes]:
-        if params:
-            encoded = urllib.parse.urlencode(params, doseq=True)
-            path = f"{path}?{encoded}"
+        path = build_path(path, params)
 
         payload = None
         merged_headers = headers or {}
@@ -67,11 +72,14 @@ class RapidApiJSearchClient:
             payload = json.dumps(body).encode("utf-8")
             merged_headers = {"Content-Type": "application/json", **merged_headers}
 
-        conn = http.client.HTTPSConnection(self.host, timeout=self.timeout)
-        conn.request(method, path, body=payload, headers=self._headers(merged_headers))
-        res = conn.getresponse()
-        data = res.read()
-        return res.status, dict(res.getheaders()), data
+        return self.transport.request(
+            self.host,
+            method,
+            path,
+            body=payload,
+            headers=self._headers(merged_headers),
+            timeout=self.timeout,
+        )
 
     def _request_json(
         self,
@@ -81,12 +89,7 @@ class RapidApiJSearchClient:
         body: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         status, headers, data = self._request(method, path, params=params, body=body)
-        text = data.decode("utf-8", errors="replace")
-        try:
-            payload = json.loads(text)
-        except json.JSONDecodeError:
-            payload = {"raw": text}
-        return {"status": status, "headers": headers, "data": payload}
+        return {"status": status, "headers": headers, "data": loads_json(data)}
 
     def search_jobs(
         self,
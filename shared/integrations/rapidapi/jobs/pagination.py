@@ -0,0 +1,70 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+PageFetcher = Callable[[int, int], Dict[str, Any]]
+
+
+def page_items(resp: Dict[str, Any]) -> List[Dict[str, Any]]:
+    data = resp.get("data") or {}
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for key in ("data", "jobs", "results"):
+            if isinstance(data.get(key), list):
+                return data[key]
+    return []
+
+
+def iter_offset_pages(
+    fetch_page: PageFetcher,
+    page_size: int,
+    max_items: Optional[int] = None,
+    start_offset: int = 0,
+    prefetch: bool = True,
+) -> Iterator[Dict[str, Any]]:
+    """Yield items across ``offset``/``limit`` pages.
+
+    ``fetch_page(offset, limit)`` returns a response envelope. Iteration
+    stops on an empty or short page, or once ``max_items`` have been yielded.
+    With ``prefetch`` the next page is requested on a background thread
+    while the current one is consumed. A non-2xx page raises RuntimeError.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be >= 1")
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+
+    def request(offset: int, limit: int) -> "Future[Dict[str, Any]]":
+        if executor is not None:
+            return executor.submit(fetch_page, offset, limit)
+        future: "Future[Dict[str, Any]]" = Future()
+        future.set_result(fetch_page(offset, limit))
+        return future
+
+    def next_limit(yielded: int) -> int:
+        if max_items is None:
+            return page_size
+        return min(page_size, max_items - yielded)
+
+    try:
+        offset = start_offset
+        yielded = 0
+        limit = next_limit(yielded)
+        pending = request(offset, limit) if limit > 0 else None
+        while pending is not None:
+            resp = pending.result()
+            status = resp.get("status")
+            if status not in (200, 201):
+                raise RuntimeError(f"Page request at offset {offset} failed: {status}")
+            items = page_items(resp)[:limit]
+            offset += len(items)
+            pending = None
+            if len(items) == limit:
+                limit = next_limit(yielded + len(items))
+                if limit > 0:
+                    pending = request(offset, limit)
+            for item in items:
+                yield item
+            yielded += len(items)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
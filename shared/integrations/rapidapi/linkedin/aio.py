@@ -0,0 +1,40 @@
+from typing import Any, Dict, Optional
+
+from shared.integrations.rapidapi.aio import (
+    DEFAULT_MAX_CONCURRENCY_PER_HOST,
+    AsyncRapidApiClient,
+    ThreadPoolFanout,
+)
+from shared.integrations.rapidapi.linkedin.client import RapidApiLinkedInClient
+from shared.integrations.rapidapi.transport import RapidApiTransport
+
+
+class AsyncRapidApiLinkedInClient(AsyncRapidApiClient):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        host: Optional[str] = None,
+        timeout: int = 30,
+        transport: Optional[RapidApiTransport] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY_PER_HOST,
+        runner: Optional[ThreadPoolFanout] = None,
+    ) -> None:
+        client = RapidApiLinkedInClient(
+            api_key=api_key, host=host, timeout=timeout, transport=transport
+        )
+        super().__init__(client, max_concurrency=max_concurrency, runner=runner)
+
+    async def get_profile_details(self, linkedin_url: str, **params: Any) -> Dict[str, Any]:
+        return await self._call(self.client.get_profile_details, linkedin_url, **params)
+
+    async def get_profile_posts(self, linkedin_url: str, **params: Any) -> Dict[str, Any]:
+        return await self._call(self.client.get_profile_posts, linkedin_url, **params)
+
+    async def get_post_comments(self, urn: str, **params: Any) -> Dict[str, Any]:
+        return await self._call(self.client.get_post_comments, urn, **params)
+
+    async def get_post_reactions(self, urn: str, **params: Any) -> Dict[str, Any]:
+        return await self._call(self.client.get_post_reactions, urn, **params)
+
+    async def search_posts(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._call(self.client.search_posts, payload)
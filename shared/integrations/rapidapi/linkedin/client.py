@@ -1,9 +1,14 @@
-import http.client
 import json
 import os
-import urllib.parse
 from typing import Any, Dict, Optional, Tuple
 
+from shared.integrations.rapidapi.codec import loads_json
+from shared.integrations.rapidapi.transport import (
+    RapidApiTransport,
+    build_path,
+    get_default_transport,
+)
+
 DEFAULT_LINKEDIN_HOST = "fresh-linkedin-profile-data.p.rapidapi.com"
 
 
@@ -21,12 +26,14 @@ class RapidApiLinkedInClient:
         api_key: Optional[str] = None,
         host: Optional[str] = None,
         timeout: int = 30,
+        transport: Optional[RapidApiTransport] = None,
     ) -> None:
         self.api_key = api_key or os.getenv("RAPID_API_KEY") or os.getenv("RAPIDAPI_KEY")
         if not self.api_key:
             raise ValueError("Missing RAPID_API_KEY (or RAPIDAPI_KEY) in environment")
         self.host = host or os.getenv("RAPIDAPI_LINKEDIN_HOST") or DEFAULT_LINKEDIN_HOST
         self.timeout = timeout
+        self.transport = transport or get_default_transport()
 
     def _headers(self, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
         headers = {
@@ -46,10 +53,8 @@ class RapidApiLinkedInClient:
         headers: Optional[Dict[str, str]] = None,
     ) -> Tuple[int, Dict[str, str], bytes]:
         if params:
-            encoded = urllib.parse.urlencode(
-                {k: v for k, v in params.items() if v is not None}, doseq=True
-            )
-            path = f"{path}?{encoded}"
+            params = {k: v for k, v in params.items() if v is not None}
+        path = build_path(path, params)
 
         payload = None
         merged_headers = headers or {}
@@ -57,11 +62,14 @@ class RapidApiLinkedInClient:
             payload = json.dumps(body).encode("utf-8")
             merged_headers = {"Content-Type": "application/json", **merged_headers}
 
-        conn = http.client.HTTPSConnection(self.host, timeout=self.timeout)
-        conn.request(method, path, body=payload, headers=self._headers(merged_headers))
-        res = conn.getresponse()
-        data = res.read()
-        return res.status, dict(res.getheaders()), data
+        return self.transport.request(
+            self.host,
+            method,
+            path,
+            body=payload,
+            headers=self._headers(merged_headers),
+            timeout=self.timeout,
+        )
 
     def _request_json(
         self,
@@ -71,12 +79,7 @@ class RapidApiLinkedInClient:
         body: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         status, headers, data = self._request(method, path, params=params, body=body)
-        text = data.decode("utf-8", errors="replace")
-        try:
-            payload = json.loads(text)
-        except json.JSONDecodeError:
-            payload = {"raw": text}
-        return {"status": status, "headers": headers, "data": payload}
+        return {"status": status, "headers": headers, "data": loads_json(data)}
 
     def get_profile_details(
         self,
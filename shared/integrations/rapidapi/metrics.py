@@ -0,0 +1,231 @@
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from shared.integrations.rapidapi.ratelimit import parse_ratelimit_headers
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+MAX_SAMPLES = 10000
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Mapping[str, Any]) -> LabelKey:
+    return tuple(sorted((k, "" if v is None else str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in pairs
+    )
+    return "{" + body + "}"
+
+
+class Histogram:
+    """Fixed-bucket histogram plus a capped reservoir for exact-ish quantiles."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self._samples: List[float] = []
+        self._rng = random.Random(0)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        if len(self._samples) < MAX_SAMPLES:
+            self._samples.append(value)
+        else:
+            slot = self._rng.randrange(self.count)
+            if slot < MAX_SAMPLES:
+                self._samples[slot] = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+        return ordered[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": [[b, c] for b, c in zip(self.buckets, self.counts)],
+        }
+
+
+class _RequestSeries:
+    def __init__(self) -> None:
+        self.statuses: Dict[str, int] = {}
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.latency = Histogram()
+
+
+class MetricsRegistry:
+    """Per-run counters for outbound HTTP calls and timed pipeline steps.
+
+    ``record_request`` is fed by the shared RapidAPI transport and the
+    webhook sender; ``timer`` wraps arbitrary operations (e.g. one source x
+    keyword fetch). Dump with ``to_json()``, ``to_prometheus()`` or ``dump()``.
+    """
+
+    def __init__(self) -> None:
+        self._requests: Dict[LabelKey, _RequestSeries] = {}
+        self._operations: Dict[LabelKey, Histogram] = {}
+        self._operation_items: Dict[LabelKey, int] = {}
+        self._quota: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def record_request(
+        self,
+        host: str,
+        endpoint: str,
+        method: str,
+        status: Any,
+        latency: float,
+        bytes_in: int = 0,
+        bytes_out: int = 0,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        key = _label_key({"host": host, "endpoint": endpoint, "method": method.upper()})
+        quota = parse_ratelimit_headers(headers) if headers else {}
+        with self._lock:
+            series = self._requests.get(key)
+            if series is None:
+                series = self._requests[key] = _RequestSeries()
+            label = str(status)
+            series.statuses[label] = series.statuses.get(label, 0) + 1
+            series.bytes_in += bytes_in
+            series.bytes_out += bytes_out
+            series.latency.observe(latency)
+            if quota:
+                self._quota[host] = quota
+
+    def record_operation(self, name: str, latency: float, items: int = 0, **labels: Any) -> None:
+        key = _label_key({"operation": name, **labels})
+        with self._lock:
+            histogram = self._operations.get(key)
+            if histogram is None:
+                histogram = self._operations[key] = Histogram()
+            histogram.observe(latency)
+            self._operation_items[key] = self._operation_items.get(key, 0) + items
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[Dict[str, int]]:
+        """Time a block; set ``counter["items"]`` inside it to record a count."""
+        counter = {"items": 0}
+        start = time.perf_counter()
+        try:
+            yield counter
+        finally:
+            self.record_operation(name, time.perf_counter() - start, counter["items"], **labels)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = [
+                {
+                    **dict(key),
+                    "calls": sum(series.statuses.values()),
+                    "statuses": dict(series.statuses),
+                    "bytes_in": series.bytes_in,
+                    "bytes_out": series.bytes_out,
+                    "latency_seconds": series.latency.to_dict(),
+                }
+                for key, series in self._requests.items()
+            ]
+            operations = [
+                {
+                    **dict(key),
+                    "items": self._operation_items.get(key, 0),
+                    "latency_seconds": histogram.to_dict(),
+                }
+                for key, histogram in self._operations.items()
+            ]
+            quota = {host: {k: dict(v) for k, v in fam.items()} for host, fam in self._quota.items()}
+        return {"requests": requests, "operations": operations, "quota": quota}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent, sort_keys=True)
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            lines.append("# TYPE http_client_requests_total counter")
+            for key, series in self._requests.items():
+                for status, count in sorted(series.statuses.items()):
+                    lines.append(
+                        f"http_client_requests_total{_format_labels(key, ('status', status))} {count}"
+                    )
+            lines.append("# TYPE http_client_received_bytes_total counter")
+            for key, series in self._requests.items():
+                lines.append(f"http_client_received_bytes_total{_format_labels(key)} {series.bytes_in}")
+            lines.append("# TYPE http_client_sent_bytes_total counter")
+            for key, series in self._requests.items():
+                lines.append(f"http_client_sent_bytes_total{_format_labels(key)} {series.bytes_out}")
+            lines.append("# TYPE http_client_request_duration_seconds histogram")
+            for key, series in self._requests.items():
+                lines.extend(_histogram_lines("http_client_request_duration_seconds", key, series.latency))
+            lines.append("# TYPE operation_duration_seconds histogram")
+            for key, histogram in self._operations.items():
+                lines.extend(_histogram_lines("operation_duration_seconds", key, histogram))
+            lines.append("# TYPE operation_items_total counter")
+            for key, items in self._operation_items.items():
+                lines.append(f"operation_items_total{_format_labels(key)} {items}")
+            lines.append("# TYPE rapidapi_ratelimit gauge")
+            for host, families in self._quota.items():
+                for family, values in families.items():
+                    for field, value in values.items():
+                        labels = _label_key({"host": host, "family": family or "default", "field": field})
+                        lines.append(f"rapidapi_ratelimit{_format_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> None:
+        """Write Prometheus text for ``*.prom``/``*.txt`` paths, JSON otherwise."""
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.suffix in (".prom", ".txt"):
+            target.write_text(self.to_prometheus())
+        else:
+            target.write_text(self.to_json() + "\n")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._operations.clear()
+            self._operation_items.clear()
+            self._quota.clear()
+
+
+def _histogram_lines(name: str, key: LabelKey, histogram: Histogram) -> List[str]:
+    lines = []
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        lines.append(f"{name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {count}")
+    lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {histogram.count}")
+    lines.append(f"{name}_sum{_format_labels(key)} {histogram.total:.6f}")
+    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+    return lines
+
+
+_default_registry = MetricsRegistry()
+
+
+def get_default_registry() -> MetricsRegistry:
+    return _default_registry
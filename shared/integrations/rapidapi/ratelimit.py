@@ -0,0 +1,207 @@
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+# RapidAPI reports plan quotas as x-ratelimit-requests-{limit,remaining,reset}
+# and some providers add a bare x-ratelimit-{limit,remaining,reset} family for
+# short-window rate limits. Other families (e.g. "jobs") count units other
+# than requests and are only surfaced in state().
+_RATELIMIT_HEADER = re.compile(r"^x-ratelimit-(?:([a-z0-9]+)-)?(limit|remaining|reset)$")
+_REQUEST_FAMILIES = ("", "requests")
+
+
+class RateLimitExceeded(RuntimeError):
+    def __init__(self, host: str, wait: float) -> None:
+        super().__init__(f"Rate limit for {host} exhausted; next slot in {wait:.0f}s")
+        self.host = host
+        self.wait = wait
+
+
+def _to_number(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(str(value).strip())
+    except ValueError:
+        return None
+
+
+def parse_ratelimit_headers(headers: Mapping[str, str]) -> Dict[str, Dict[str, float]]:
+    families: Dict[str, Dict[str, float]] = {}
+    for name, value in headers.items():
+        match = _RATELIMIT_HEADER.match(name.lower())
+        if not match:
+            continue
+        number = _to_number(value)
+        if number is None:
+            continue
+        families.setdefault(match.group(1) or "", {})[match.group(2)] = number
+    return families
+
+
+class HostBucket:
+    """Token bucket for one host, re-seeded from every response's headers.
+
+    Until a host reports limits it is not throttled. Once it does, the
+    remaining allowance (minus ``headroom``) is spent before the reset. When
+    the reset is within ``pace_horizon`` seconds the allowance is spread
+    evenly over that window after an initial ``burst``; longer windows (daily
+    or monthly plan quotas) are spent freely and only block at exhaustion.
+    """
+
+    def __init__(self, headroom: int, burst: int, pace_horizon: float) -> None:
+        self.headroom = headroom
+        self.burst = burst
+        self.pace_horizon = pace_horizon
+        self.limit: Optional[float] = None
+        self.remaining: Optional[float] = None
+        self.reset_at: Optional[float] = None
+        self.tokens: Optional[float] = None
+        self.rate = 0.0
+        self.updated_at = time.monotonic()
+        self.backoff_until = 0.0
+        self.consecutive_429 = 0
+        self.families: Dict[str, Dict[str, float]] = {}
+
+    def _refill(self, now: float) -> None:
+        if self.tokens is None:
+            return
+        if self.reset_at is not None and now >= self.reset_at:
+            # Window rolled over; allow one probe request to learn the new state.
+            self.tokens = max(self.tokens, 1.0)
+            self.rate = 0.0
+            self.reset_at = None
+        elif self.rate:
+            self.tokens += self.rate * (now - self.updated_at)
+        self.updated_at = now
+
+    def reserve(self, now: float) -> float:
+        """Take a token if one is available; otherwise return seconds to wait."""
+        self._refill(now)
+        if now < self.backoff_until:
+            return self.backoff_until - now
+        if self.tokens is None:
+            return 0.0
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        if self.rate:
+            return (1 - self.tokens) / self.rate
+        if self.reset_at is not None:
+            return self.reset_at - now
+        return 0.0
+
+    def observe(self, status: int, headers: Mapping[str, str], now: float) -> None:
+        families = parse_ratelimit_headers(headers)
+        if families:
+            self.families = families
+        # The most restrictive request family governs pacing.
+        chosen: Optional[Tuple[float, float, Optional[float]]] = None
+        for name in _REQUEST_FAMILIES:
+            family = families.get(name)
+            if not family or "remaining" not in family:
+                continue
+            remaining = family["remaining"]
+            reset = family.get("reset")
+            if chosen is None or remaining < chosen[0]:
+                chosen = (remaining, reset if reset is not None else 0.0, family.get("limit"))
+        if chosen is not None:
+            remaining, reset, limit = chosen
+            allowance = max(0.0, remaining - self.headroom)
+            self.limit = limit
+            self.remaining = remaining
+            self.reset_at = now + reset if reset > 0 else None
+            if self.reset_at is not None and reset <= self.pace_horizon:
+                # Never re-grant the burst on every response; only the refill
+                # rate is re-derived from the authoritative remaining count.
+                current = self.tokens if self.tokens is not None else float(self.burst)
+                initial = min(current, float(self.burst), allowance)
+                self.tokens = initial
+                self.rate = (allowance - initial) / reset
+            else:
+                self.tokens = allowance
+                self.rate = 0.0
+            self.updated_at = now
+
+        if status == 429:
+            self.consecutive_429 += 1
+            retry_after = _to_number(headers.get("Retry-After") or headers.get("retry-after"))
+            delay = retry_after if retry_after is not None else min(60.0, 2.0 ** self.consecutive_429)
+            self.backoff_until = max(self.backoff_until, now + delay)
+            # Multiplicative decrease: the learned rate was too optimistic.
+            self.rate /= 2
+            if self.tokens is not None:
+                self.tokens = min(self.tokens, 0.0)
+        elif 200 <= status < 300:
+            self.consecutive_429 = 0
+
+    def state(self, now: float) -> Dict[str, Any]:
+        self._refill(now)
+        return {
+            "tokens": self.tokens,
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset_in": max(0.0, self.reset_at - now) if self.reset_at is not None else None,
+            "rate_per_sec": self.rate,
+            "backoff_in": max(0.0, self.backoff_until - now),
+            "consecutive_429": self.consecutive_429,
+            "families": {name or "default": dict(values) for name, values in self.families.items()},
+        }
+
+
+class RateLimiter:
+    """Per-host token buckets driven by RapidAPI ``x-ratelimit-*`` headers.
+
+    ``acquire()`` blocks until a request may be sent, raising
+    ``RateLimitExceeded`` instead when the wait would exceed ``max_wait``.
+    ``observe()`` feeds each response back so the buckets track live limits.
+    """
+
+    def __init__(
+        self,
+        headroom: int = 1,
+        burst: int = 5,
+        pace_horizon: float = 3600,
+        max_wait: float = 120,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.headroom = headroom
+        self.burst = burst
+        self.pace_horizon = pace_horizon
+        self.max_wait = max_wait
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: Dict[str, HostBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> HostBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = HostBucket(self.headroom, self.burst, self.pace_horizon)
+            self._buckets[host] = bucket
+        return bucket
+
+    def acquire(self, host: str) -> None:
+        while True:
+            with self._lock:
+                wait = self._bucket(host).reserve(self._clock())
+            if wait <= 0:
+                return
+            if wait > self.max_wait:
+                raise RateLimitExceeded(host, wait)
+            self._sleep(wait)
+
+    def observe(self, host: str, status: int, headers: Mapping[str, str]) -> None:
+        with self._lock:
+            self._bucket(host).observe(status, headers, self._clock())
+
+    def state(self, host: str) -> Dict[str, Any]:
+        with self._lock:
+            return self._bucket(host).state(self._clock())
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            now = self._clock()
+            return {host: bucket.state(now) for host, bucket in self._buckets.items()}
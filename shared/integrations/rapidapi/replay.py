@@ -0,0 +1,312 @@
+import gzip
+import hashlib
+import http.client
+import http.server
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from shared.integrations.rapidapi.cache import canonical_path
+from shared.integrations.rapidapi.codec import decoded_headers
+
+_PAGING_PARAMS = ("limit", "offset")
+
+
+def _fixture_name(host: str, path: str) -> str:
+    digest = hashlib.sha1(canonical_path(path).encode("utf-8")).hexdigest()[:16]
+    endpoint = path.partition("?")[0].strip("/").replace("/", "_") or "root"
+    return f"{host}/{endpoint}-{digest}.json"
+
+
+def _without_paging(path: str) -> str:
+    base, _, query = path.partition("?")
+    pairs = [
+        (k, v)
+        for k, v in urllib.parse.parse_qsl(query, keep_blank_values=True)
+        if k not in _PAGING_PARAMS
+    ]
+    return canonical_path(f"{base}?{urllib.parse.urlencode(pairs)}" if pairs else base)
+
+
+class ResponseRecorder:
+    """Writes each network response to ``directory`` as a JSON fixture."""
+
+    def __init__(self, directory: os.PathLike) -> None:
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseRecorder"]:
+        """Record when ``RAPIDAPI_RECORD_DIR`` is set, else None."""
+        directory = os.getenv("RAPIDAPI_RECORD_DIR")
+        return cls(directory) if directory else None
+
+    def record(
+        self,
+        host: str,
+        method: str,
+        path: str,
+        status: int,
+        headers: Dict[str, str],
+        data: bytes,
+    ) -> None:
+        target = self.directory / _fixture_name(host, path)
+        fixture = {
+            "host": host,
+            "method": method.upper(),
+            "path": path,
+            "status": status,
+            "headers": decoded_headers(headers),
+            "body": data.decode("utf-8", errors="replace"),
+        }
+        with self._lock:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(json.dumps(fixture))
+
+
+class FixtureStore:
+    """Recorded responses looked up by host and request path.
+
+    Lookups fall back from the exact canonical path, to the same path without
+    ``limit``/``offset``, to the bare endpoint. List bodies found through a
+    fallback are sliced by the request's ``offset``/``limit`` so one large
+    recording can serve any page size.
+    """
+
+    def __init__(self) -> None:
+        self._exact: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._unpaged: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._endpoint: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, directory: os.PathLike) -> "FixtureStore":
+        store = cls()
+        for path in sorted(Path(directory).rglob("*.json")):
+            fixture = json.loads(path.read_text())
+            store.add(
+                fixture["host"],
+                fixture["path"],
+                fixture.get("status", 200),
+                fixture.get("headers", {}),
+                fixture.get("body", ""),
+            )
+        return store
+
+    def add(self, host: str, path: str, status: int, headers: Dict[str, str], body: Any) -> None:
+        if not isinstance(body, str):
+            body = json.dumps(body)
+        fixture = {"status": status, "headers": headers, "body": body}
+        host = host.lower()
+        self._exact[(host, canonical_path(path))] = fixture
+        for index, key in (
+            (self._unpaged, _without_paging(path)),
+            (self._endpoint, path.partition("?")[0]),
+        ):
+            # Keep the largest recording as the fallback source for slicing.
+            current = index.get((host, key))
+            if current is None or len(body) > len(current["body"]):
+                index[(host, key)] = fixture
+
+    def lookup(
+        self, host: str, path: str, page_size: Optional[int] = None
+    ) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        host = host.lower()
+        fixture = self._exact.get((host, canonical_path(path)))
+        sliced = page_size is not None
+        if fixture is None:
+            fixture = self._unpaged.get((host, _without_paging(path))) or self._endpoint.get(
+                (host, path.partition("?")[0])
+            )
+            sliced = True
+        if fixture is None:
+            return None
+        body = fixture["body"].encode("utf-8")
+        if sliced:
+            body = self._slice(body, path, page_size)
+        return fixture["status"], dict(fixture["headers"]), body
+
+    @staticmethod
+    def _slice(body: bytes, path: str, page_size: Optional[int]) -> bytes:
+        try:
+            items = json.loads(body)
+        except ValueError:
+            return body
+        if not isinstance(items, list):
+            return body
+        query = dict(urllib.parse.parse_qsl(path.partition("?")[2]))
+        offset = int(query.get("offset") or 0)
+        limit = int(query.get("limit") or len(items))
+        if page_size is not None:
+            limit = min(limit, page_size)
+        return json.dumps(items[offset : offset + limit]).encode("utf-8")
+
+
+class ReplayServer:
+    """Local HTTP stand-in for RapidAPI hosts and the webhook endpoint.
+
+    GET requests are answered from a ``FixtureStore`` by the
+    ``x-rapidapi-host`` header; POSTs are accepted as webhook ingests.
+    ``latency``/``jitter`` (seconds) delay every reply, ``error_rate``
+    (GETs) and ``ingest_error_rate`` (POSTs) answer that fraction with
+    ``error_status``, and ``page_size`` caps list pages. Ingests larger than
+    ``ingest_max_bytes`` get a 413, and ``ingest_seconds_per_mb`` adds
+    size-proportional latency to each ingest. Ingest bodies may be chunked
+    (unless ``ingest_chunked`` is False, which answers 411) and gzipped
+    (unless ``ingest_gzip`` is False, which answers 415); they must hold a
+    JSON object. Point clients at it with
+    ``RapidApiTransport(connection_factory=server.connection_factory)``.
+    """
+
+    def __init__(
+        self,
+        store: FixtureStore,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        page_size: Optional[int] = None,
+        ingest_error_rate: float = 0.0,
+        ingest_max_bytes: Optional[int] = None,
+        ingest_seconds_per_mb: float = 0.0,
+        ingest_gzip: bool = True,
+        ingest_chunked: bool = True,
+        seed: int = 0,
+    ) -> None:
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.ingest_error_rate = ingest_error_rate
+        self.ingest_max_bytes = ingest_max_bytes
+        self.ingest_seconds_per_mb = ingest_seconds_per_mb
+        self.ingest_gzip = ingest_gzip
+        self.ingest_chunked = ingest_chunked
+        self.error_status = error_status
+        self.page_size = page_size
+        self.ingested: List[int] = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def connection_factory(self, host: str, timeout: float) -> http.client.HTTPConnection:
+        return http.client.HTTPConnection("127.0.0.1", self.port, timeout=timeout)
+
+    def _delay_and_fail(self, error_rate: float) -> bool:
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = error_rate > 0 and self._rng.random() < error_rate
+        if delay:
+            time.sleep(delay)
+        return fail
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; without this,
+            # Nagle + delayed ACK adds ~40 ms to every keep-alive reply.
+            disable_nagle_algorithm = True
+
+            def _reply(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+                headers = dict(headers or {})
+                if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+                    body = gzip.compress(body, compresslevel=6)
+                    headers["Content-Encoding"] = "gzip"
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                if server._delay_and_fail(server.error_rate):
+                    self._reply(server.error_status, b'{"message":"injected error"}')
+                    return
+                host = self.headers.get("x-rapidapi-host") or self.headers.get("Host") or ""
+                hit = server.store.lookup(host, self.path, page_size=server.page_size)
+                if hit is None:
+                    self._reply(404, b'{"message":"no fixture"}')
+                    return
+                status, headers, body = hit
+                self._reply(status, body, headers)
+
+            def _read_request_body(self) -> bytes:
+                if (self.headers.get("Transfer-Encoding") or "").lower() != "chunked":
+                    return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                chunks = []
+                while True:
+                    size = int(self.rfile.readline().split(b";")[0], 16)
+                    if not size:
+                        # Skip (empty) trailers up to the final CRLF.
+                        while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                            pass
+                        return b"".join(chunks)
+                    chunks.append(self.rfile.read(size))
+                    self.rfile.readline()
+
+            def do_POST(self) -> None:
+                chunked = (self.headers.get("Transfer-Encoding") or "").lower() == "chunked"
+                body = self._read_request_body()
+                if chunked and not server.ingest_chunked:
+                    self._reply(411, b'{"message":"length required"}')
+                    return
+                length = len(body)
+                if (self.headers.get("Content-Encoding") or "").lower() == "gzip":
+                    if not server.ingest_gzip:
+                        self._reply(415, b'{"message":"unsupported content encoding"}')
+                        return
+                    body = gzip.decompress(body)
+                try:
+                    json.loads(body)
+                except ValueError:
+                    self._reply(400, b'{"message":"invalid JSON"}')
+                    return
+                if server.ingest_max_bytes is not None and length > server.ingest_max_bytes:
+                    self._reply(413, b'{"message":"payload too large"}')
+                    return
+                if server.ingest_seconds_per_mb:
+                    time.sleep(length / (1024 * 1024) * server.ingest_seconds_per_mb)
+                if server._delay_and_fail(server.ingest_error_rate):
+                    self._reply(server.error_status, b'{"message":"injected error"}')
+                    return
+                with server._lock:
+                    server.ingested.append(length)
+                self._reply(200, b'{"ok":true}')
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
@@ -0,0 +1,159 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, Optional
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, host: str, retry_in: float) -> None:
+        super().__init__(f"Circuit open for {host}; retry in {retry_in:.0f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class RetryPolicy:
+    """Jittered exponential backoff for idempotent requests, on a budget.
+
+    Every request deposits ``budget_ratio`` retry tokens (on top of a
+    ``min_budget`` floor) and every retry spends one, so a struggling
+    provider cannot turn a run into a retry storm.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 10.0,
+        budget_ratio: float = 0.2,
+        min_budget: float = 10.0,
+        retry_statuses: FrozenSet[int] = RETRYABLE_STATUSES,
+        methods: FrozenSet[str] = IDEMPOTENT_METHODS,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.min_budget = min_budget
+        self.retry_statuses = retry_statuses
+        self.methods = methods
+        self._rng = rng or random.Random()
+        self._budget = min_budget
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._budget = min(self._budget + self.budget_ratio, self.min_budget + 1000)
+
+    def can_retry(self, method: str, attempt: int) -> bool:
+        """``attempt`` is the 1-based number of the attempt that just failed."""
+        if method.upper() not in self.methods or attempt >= self.max_attempts:
+            return False
+        with self._lock:
+            if self._budget < 1:
+                return False
+            self._budget -= 1
+            return True
+
+    def backoff(self, attempt: int) -> float:
+        # Full jitter: uniform over [0, base * 2^(attempt-1)], capped.
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return self._rng.uniform(0, ceiling)
+
+    @property
+    def budget(self) -> float:
+        with self._lock:
+            return self._budget
+
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures -> half-open single probe."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            now = self._clock()
+            if self.state == self.OPEN:
+                retry_in = self.opened_at + self.reset_timeout - now
+                if retry_in > 0:
+                    raise CircuitOpenError(self.host, retry_in)
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                raise CircuitOpenError(self.host, 0)
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self._clock()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures}
+
+
+class CircuitBreakerRegistry:
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    host,
+                    failure_threshold=self.failure_threshold,
+                    reset_timeout=self.reset_timeout,
+                    clock=self._clock,
+                )
+                self._breakers[host] = breaker
+            return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.host: breaker.snapshot() for breaker in breakers}
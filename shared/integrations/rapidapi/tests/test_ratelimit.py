@@ -0,0 +1,109 @@
+import pytest
+
+from shared.integrations.rapidapi.ratelimit import (
+    RateLimiter,
+    RateLimitExceeded,
+    parse_ratelimit_headers,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _limiter(clock: FakeClock, **kwargs) -> RateLimiter:
+    return RateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_parse_groups_families_case_insensitively():
+    headers = {
+        "X-RateLimit-Requests-Limit": "1000",
+        "x-ratelimit-requests-remaining": " 998 ",
+        "X-RateLimit-Requests-Reset": "86400",
+        "X-RateLimit-Remaining": "4",
+        "X-RateLimit-Jobs-Remaining": "250",
+        "Content-Type": "application/json",
+    }
+    assert parse_ratelimit_headers(headers) == {
+        "requests": {"limit": 1000.0, "remaining": 998.0, "reset": 86400.0},
+        "": {"remaining": 4.0},
+        "jobs": {"remaining": 250.0},
+    }
+
+
+def test_parse_skips_non_numeric_values():
+    headers = {"x-ratelimit-requests-remaining": "unlimited", "x-ratelimit-requests-limit": "10"}
+    assert parse_ratelimit_headers(headers) == {"requests": {"limit": 10.0}}
+
+
+def test_hosts_without_headers_are_not_throttled():
+    clock = FakeClock()
+    limiter = _limiter(clock)
+    for _ in range(100):
+        limiter.acquire("api.example.com")
+    assert clock.now == 0.0
+
+
+def test_the_most_restrictive_request_family_governs():
+    clock = FakeClock()
+    limiter = _limiter(clock, headroom=0)
+    limiter.observe(
+        "api.example.com",
+        200,
+        {
+            "x-ratelimit-requests-remaining": "500",
+            "x-ratelimit-requests-reset": "86400",
+            "x-ratelimit-remaining": "2",
+            "x-ratelimit-reset": "86400",
+            # Non-request units never pace requests.
+            "x-ratelimit-jobs-remaining": "0",
+        },
+    )
+    state = limiter.state("api.example.com")
+    assert state["remaining"] == 2
+    assert state["tokens"] == 2
+
+
+def test_short_windows_are_paced_after_the_burst():
+    clock = FakeClock()
+    limiter = _limiter(clock, headroom=1, burst=5)
+    limiter.observe(
+        "api.example.com",
+        200,
+        {"x-ratelimit-requests-remaining": "11", "x-ratelimit-requests-reset": "10"},
+    )
+    for _ in range(5):
+        limiter.acquire("api.example.com")
+    assert clock.now == 0.0
+    # The other 5 of the allowance of 10 are spread over the 10 s window.
+    limiter.acquire("api.example.com")
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_429_backs_off_for_retry_after():
+    clock = FakeClock()
+    limiter = _limiter(clock)
+    limiter.observe("api.example.com", 429, {"Retry-After": "7"})
+    limiter.acquire("api.example.com")
+    assert clock.now == pytest.approx(7.0)
+
+
+def test_exhausted_quota_raises_instead_of_waiting_past_max_wait():
+    clock = FakeClock()
+    limiter = _limiter(clock, headroom=0, max_wait=60)
+    limiter.observe(
+        "api.example.com",
+        200,
+        {"x-ratelimit-requests-remaining": "0", "x-ratelimit-requests-reset": "86400"},
+    )
+    with pytest.raises(RateLimitExceeded) as excinfo:
+        limiter.acquire("api.example.com")
+    assert excinfo.value.wait == pytest.approx(86400)
+    assert clock.now == 0.0
@@ -0,0 +1,356 @@
+import http.client
+import threading
+import time
+import urllib.parse
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from shared.integrations.rapidapi.cache import ResponseCache
+from shared.integrations.rapidapi.codec import ACCEPT_ENCODING, decoded_headers, decompressor
+from shared.integrations.rapidapi.metrics import MetricsRegistry, get_default_registry
+from shared.integrations.rapidapi.ratelimit import RateLimiter
+from shared.integrations.rapidapi.replay import ResponseRecorder
+from shared.integrations.rapidapi.retry import CircuitBreakerRegistry, RetryPolicy
+
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 16
+READ_CHUNK_SIZE = 64 * 1024
+
+ConnectionFactory = Callable[[str, float], http.client.HTTPConnection]
+# Bytes, or a re-iterable of chunks sent with chunked transfer encoding
+# (iterated again on retry); it may expose the bytes sent as ``wire_size``.
+RequestBody = Union[bytes, Iterable[bytes]]
+
+# Errors raised when a kept-alive socket was closed by the server between
+# requests. Only safe to replay on a reused connection.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+# Network-level failures worth retrying (timeouts, resets, malformed replies).
+_RETRYABLE_ERRORS = (OSError, http.client.HTTPException)
+
+
+def _read_body(res: http.client.HTTPResponse) -> Tuple[bytes, int]:
+    """Return ``(identity body, bytes received on the wire)``."""
+    decoder = decompressor(res.getheader("Content-Encoding"))
+    if decoder is None:
+        data = res.read()
+        return data, len(data)
+    chunks: List[bytes] = []
+    wire = 0
+    while True:
+        chunk = res.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        wire += len(chunk)
+        chunks.append(decoder.decompress(chunk))
+    chunks.append(decoder.flush())
+    return b"".join(chunks), wire
+
+
+def _body_size(body: Optional[RequestBody]) -> int:
+    if body is None:
+        return 0
+    if isinstance(body, bytes):
+        return len(body)
+    return getattr(body, "wire_size", 0)
+
+
+def build_path(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    if params:
+        encoded = urllib.parse.urlencode(params, doseq=True)
+        path = f"{path}?{encoded}"
+    return path
+
+
+class ConnectionPool:
+    """Idle keep-alive connections to a single host, reused LIFO."""
+
+    def __init__(
+        self,
+        host: str,
+        timeout: float = 30,
+        max_size: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        connection_factory: Optional[ConnectionFactory] = None,
+    ) -> None:
+        self.host = host
+        self.timeout = timeout
+        self.max_size = max_size
+        self.connection_factory = connection_factory
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        if self.connection_factory is not None:
+            return self.connection_factory(self.host, self.timeout)
+        return http.client.HTTPSConnection(self.host, timeout=self.timeout)
+
+    def acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """Return ``(connection, reused)``."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"Connection pool for {self.host} is closed")
+            if self._idle:
+                return self._idle.pop(), True
+        return self._new_connection(), False
+
+    def release(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if not self._closed and len(self._idle) < self.max_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def discard(self, conn: http.client.HTTPConnection) -> None:
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class RapidApiTransport:
+    """Thread-safe HTTPS transport with one keep-alive pool per host.
+
+    All RapidAPI clients share ``get_default_transport()`` unless they are
+    handed their own instance. Use as a context manager (or call ``close()``)
+    to release pooled sockets deterministically. When a ``rate_limiter`` is
+    set, every request waits for a slot and reports the response headers back.
+    ``retry_policy`` retries idempotent requests on transient failures and
+    ``circuit_breakers`` fail fast (``CircuitOpenError``) while a host is down.
+    Responses are requested gzip/deflate-compressed and inflated while
+    streaming, so callers always receive the identity body. With a ``cache``,
+    fresh GET responses are served from disk (marked ``X-Cache: HIT``).
+    Every attempt (and cache hit) is recorded in ``metrics`` when set, and
+    network responses are written to ``recorder`` for offline replay.
+    ``connection_factory(host, timeout)`` overrides how sockets are opened
+    (e.g. to point every host at a local replay server).
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+        cache: Optional[ResponseCache] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        recorder: Optional[ResponseRecorder] = None,
+        connection_factory: Optional[ConnectionFactory] = None,
+    ) -> None:
+        self.max_connections_per_host = max_connections_per_host
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breakers = circuit_breakers
+        self.cache = cache
+        self.metrics = metrics
+        self.recorder = recorder
+        self.connection_factory = connection_factory
+        self._pools: Dict[Tuple[str, float], ConnectionPool] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "RapidApiTransport":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _pool(self, host: str, timeout: float) -> ConnectionPool:
+        key = (host, timeout)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(
+                    host,
+                    timeout=timeout,
+                    max_size=self.max_connections_per_host,
+                    connection_factory=self.connection_factory,
+                )
+                self._pools[key] = pool
+            return pool
+
+    def _send(
+        self,
+        pool: ConnectionPool,
+        method: str,
+        path: str,
+        body: Optional[RequestBody],
+        headers: Dict[str, str],
+    ) -> Tuple[int, Dict[str, str], bytes, int]:
+        while True:
+            conn, reused = pool.acquire()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                res = conn.getresponse()
+                data, wire = _read_body(res)
+            except _STALE_CONNECTION_ERRORS:
+                pool.discard(conn)
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                pool.discard(conn)
+                raise
+            if res.will_close:
+                pool.discard(conn)
+            else:
+                pool.release(conn)
+            return res.status, dict(res.getheaders()), data, wire
+
+    def request(
+        self,
+        host: str,
+        method: str,
+        path: str,
+        body: Optional[RequestBody] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30,
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        endpoint = path.partition("?")[0]
+        use_cache = self.cache is not None and method.upper() == "GET"
+        if use_cache:
+            cached = self.cached(host, path)
+            if cached is not None:
+                if self.metrics is not None:
+                    self.metrics.record_request(host, endpoint, method, "cache_hit", 0.0)
+                return cached
+        pool = self._pool(host, timeout)
+        headers = dict(headers or {})
+        if not any(name.lower() == "accept-encoding" for name in headers):
+            headers["Accept-Encoding"] = ACCEPT_ENCODING
+        breaker = self.circuit_breakers.get(host) if self.circuit_breakers else None
+        policy = self.retry_policy
+        if policy is not None:
+            policy.record_request()
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(host)
+            if breaker is not None:
+                breaker.before_request()
+            started = time.perf_counter()
+            try:
+                status, response_headers, data, wire = self._send(
+                    pool, method, path, body, headers
+                )
+            except _RETRYABLE_ERRORS as exc:
+                if self.metrics is not None:
+                    self.metrics.record_request(
+                        host,
+                        endpoint,
+                        method,
+                        type(exc).__name__,
+                        time.perf_counter() - started,
+                        bytes_out=_body_size(body),
+                    )
+                if breaker is not None:
+                    breaker.record_failure()
+                if policy is not None and policy.can_retry(method, attempt):
+                    time.sleep(policy.backoff(attempt))
+                    continue
+                raise
+            except BaseException:
+                # Anything else (a body that fails to encode, an interrupt)
+                # must still release a half-open probe.
+                if breaker is not None:
+                    breaker.record_failure()
+                raise
+
+            if self.metrics is not None:
+                self.metrics.record_request(
+                    host,
+                    endpoint,
+                    method,
+                    status,
+                    time.perf_counter() - started,
+                    bytes_in=wire,
+                    bytes_out=_body_size(body),
+                    headers=response_headers,
+                )
+            if self.rate_limiter is not None:
+                self.rate_limiter.observe(host, status, response_headers)
+            if breaker is not None:
+                # 429 means "slow down", not "provider down"; the rate
+                # limiter handles it, so it does not trip the breaker.
+                if status >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            if (
+                policy is not None
+                and status in policy.retry_statuses
+                and policy.can_retry(method, attempt)
+            ):
+                if status != 429 or self.rate_limiter is None:
+                    time.sleep(policy.backoff(attempt))
+                continue
+            if self.recorder is not None:
+                self.recorder.record(host, method, path, status, response_headers, data)
+            if use_cache and 200 <= status < 300:
+                self.cache.put(host, path, status, decoded_headers(response_headers), data)
+            return status, response_headers, data
+
+    def cached(
+        self, host: str, path: str, max_age: Optional[float] = None
+    ) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """Return a fresh cached GET response without touching the network."""
+        if self.cache is None:
+            return None
+        hit = self.cache.get(host, path, max_age=max_age)
+        if hit is None:
+            return None
+        status, response_headers, data = hit
+        return status, {**response_headers, "X-Cache": "HIT"}, data
+
+    def rate_limit_state(self, host: Optional[str] = None) -> Dict[str, Any]:
+        if self.rate_limiter is None:
+            return {}
+        if host is None:
+            return self.rate_limiter.snapshot()
+        return self.rate_limiter.state(host)
+
+    def circuit_state(self) -> Dict[str, Any]:
+        if self.circuit_breakers is None:
+            return {}
+        return self.circuit_breakers.snapshot()
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
+
+
+_default_transport: Optional[RapidApiTransport] = None
+_default_lock = threading.Lock()
+
+
+def get_default_transport() -> RapidApiTransport:
+    global _default_transport
+    with _default_lock:
+        if _default_transport is None:
+            _default_transport = RapidApiTransport(
+                rate_limiter=RateLimiter(),
+                retry_policy=RetryPolicy(),
+                circuit_breakers=CircuitBreakerRegistry(),
+                cache=ResponseCache.from_env(),
+                metrics=get_default_registry(),
+                recorder=ResponseRecorder.from_env(),
+            )
+        return _default_transport
+
+
+def close_default_transport() -> None:
+    global _default_transport
+    with _default_lock:
+        transport, _default_transport = _default_transport, None
+    if transport is not None:
+        transport.close()